@@ -0,0 +1,149 @@
+"""
+Compare reporting queries on the columnar analytics snapshot with the
+equivalent ORM aggregation, and time full builds and incremental refreshes.
+
+Runs against a throwaway test database seeded with synthetic data.
+
+Usage:
+    python benchmarks/analytics.py [employees]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F
+from django.db.models.functions import ExtractQuarter, ExtractYear
+from employee_tracker import analytics
+from employee_tracker.models import AchievementEmployee, Employee
+from employee_tracker.tests import factories
+
+
+def seed(user, employees):
+    departments = [factories.create_department(user) for _ in range(20)]
+    achievements = [factories.create_achievement(user) for _ in range(50)]
+    Employee.objects.bulk_create(
+        Employee(
+            name=f"Employee {i}",
+            email=f"bench{i}@example.com",
+            phone="1234567890",
+            address="123 Main St",
+            department=random.choice(departments),
+            created_by=user,
+        )
+        for i in range(employees)
+    )
+    start = date(2020, 1, 1)
+    AchievementEmployee.objects.bulk_create(
+        AchievementEmployee(
+            employee=employee,
+            achievement=achievement,
+            achievement_date=start + timedelta(days=random.randrange(1500)),
+        )
+        for employee in Employee.objects.filter(created_by=user)
+        for achievement in random.sample(achievements, random.randrange(1, 10))
+    )
+
+
+def orm_department_quarter(user):
+    return list(
+        AchievementEmployee.objects.filter(
+            employee__created_by=user, employee__deleted_at__isnull=True
+        )
+        .values(
+            department=F("employee__department_id"),
+            year=ExtractYear("achievement_date"),
+            quarter=ExtractQuarter("achievement_date"),
+        )
+        .annotate(count=Count("id"))
+        .order_by("department", "year", "quarter")
+    )
+
+
+def orm_co_occurrence(user):
+    awards = AchievementEmployee.objects.filter(
+        employee__created_by=user, employee__deleted_at__isnull=True
+    )
+    return list(
+        awards.values(
+            first=F("achievement_id"),
+            second=F("employee__achievementemployee__achievement_id"),
+        ).annotate(count=Count("id"))
+    )
+
+
+def measure(func, min_time=0.5):
+    runs, start = 0, time.perf_counter()
+    while True:
+        func()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / runs
+
+
+def report(label, seconds):
+    print(f"{label:<44} {seconds * 1000:9.2f} ms")
+
+
+def main(employees=20_000):
+    if analytics.np is None:
+        sys.exit("NumPy is not installed.")
+    random.seed(0)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    tmpdir = tempfile.TemporaryDirectory()
+    settings.ANALYTICS_DIR = tmpdir.name
+    try:
+        user = factories.create_user()
+        seed(user, employees)
+        awards = AchievementEmployee.objects.count()
+        print(f"{employees} employees, {awards} awards")
+
+        report("Full build", measure(lambda: analytics.build_snapshot(user.pk), 0))
+        snapshot = analytics.Snapshot.load(user.pk)
+        report(
+            "Awards per department per quarter (ORM)",
+            measure(lambda: orm_department_quarter(user)),
+        )
+        report(
+            "Awards per department per quarter (snapshot)",
+            measure(lambda: snapshot.count_by("department", "year", "quarter")),
+        )
+        report(
+            "Achievement co-occurrence (ORM)", measure(lambda: orm_co_occurrence(user))
+        )
+        report("Achievement co-occurrence (snapshot)", measure(snapshot.co_occurrence))
+        report(
+            "Load snapshot (memory-mapped)",
+            measure(lambda: analytics.Snapshot.load(user.pk)),
+        )
+
+        analytics.REFRESH_OVERLAP = timedelta(0)
+        analytics.build_snapshot(user.pk)
+        changed = Employee.objects.filter(created_by=user)[: employees // 100]
+        for employee in changed:
+            employee.save()
+        report(
+            f"Incremental refresh ({len(changed)} changed employees)",
+            measure(lambda: analytics.refresh_snapshot(user.pk), 0),
+        )
+    finally:
+        tmpdir.cleanup()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
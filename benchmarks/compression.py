@@ -0,0 +1,100 @@
+"""
+Measure the CPU cost and the bytes saved by each compression codec and
+level on an employee list page with nested achievements.
+
+Usage:
+    python benchmarks/compression.py [employees]
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django
+
+django.setup()
+
+from core.compression import CODECS, compress, compress_stream
+
+LEVELS = {
+    "gzip": [1, 4, 6, 9],
+    "br": [1, 4, 6, 9, 11],
+    "zstd": [1, 3, 6, 12, 19],
+}
+
+
+def employee_page(employees):
+    """Return a JSON list page shaped like the `/api/employees/` response."""
+    return json.dumps(
+        {
+            "count": employees,
+            "next": None,
+            "previous": None,
+            "results": [
+                {
+                    "id": i,
+                    "name": f"Employee {i}",
+                    "email": f"employee{i}@example.com",
+                    "phone": f"555{i:07d}",
+                    "address": f"{i} Main St, Springfield",
+                    "department": {"id": i % 12, "name": f"Department {i % 12}"},
+                    "achievements": [
+                        {
+                            "id": i * 10 + j,
+                            "achievement": {"id": j, "name": f"Achievement {j}"},
+                            "achievement_date": f"2023-{j % 12 + 1:02d}-{j % 28 + 1:02d}",
+                        }
+                        for j in range(i % 8)
+                    ],
+                }
+                for i in range(employees)
+            ],
+        }
+    ).encode()
+
+
+def measure(func, min_time=0.2):
+    """Return the mean seconds per call of `func`, run for at least `min_time`."""
+    runs, start = 0, time.perf_counter()
+    while True:
+        func()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / runs
+
+
+def main(employees=1000):
+    body = employee_page(employees)
+    chunks = [body[i : i + 8192] for i in range(0, len(body), 8192)]
+    print(f"Body: {len(body) / 1024:.1f} KiB ({employees} employees)")
+    print(
+        f"{'codec':<6} {'level':>5} {'ms':>8} {'MB/s':>8} {'size KiB':>9} "
+        f"{'ratio':>6} {'saved KiB/ms':>13} {'stream ms':>10}"
+    )
+    for encoding, levels in LEVELS.items():
+        if encoding not in CODECS:
+            print(f"{encoding:<6} not installed")
+            continue
+        for level in levels:
+            size = len(compress(body, encoding, level))
+            seconds = measure(lambda: compress(body, encoding, level))
+            stream_seconds = measure(
+                lambda: b"".join(compress_stream(chunks, encoding, level))
+            )
+            ms = seconds * 1000
+            print(
+                f"{encoding:<6} {level:>5} {ms:>8.2f} "
+                f"{len(body) / seconds / 1e6:>8.1f} {size / 1024:>9.1f} "
+                f"{len(body) / size:>6.1f} {(len(body) - size) / 1024 / ms:>13.1f} "
+                f"{stream_seconds * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,114 @@
+"""
+Measure cold-start latency: `django.setup()` via `core.wsgi`/`core.asgi`
+plus the first requests a fresh worker serves.
+
+Each sample runs in a new interpreter so imports are not shared.
+
+Usage:
+    python benchmarks/startup.py [runs]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PATHS = ["/api/employees/", "/api/schema/"]
+
+
+def wsgi_request(application, path):
+    environ = {"PATH_INFO": path, "REQUEST_METHOD": "GET"}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = application(environ, lambda status, headers: statuses.append(status))
+    b"".join(body)
+    body.close()
+    return statuses[0]
+
+
+def asgi_request(application, path):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"host", b"127.0.0.1")],
+        "server": ("127.0.0.1", 80),
+        "client": ("127.0.0.1", 12345),
+    }
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # Stay connected; Django cancels this wait once the response is sent.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return messages[0]["status"]
+
+
+def child(interface):
+    """Time one cold start in the current (fresh) interpreter."""
+    sys.path.insert(0, str(BASE_DIR))
+    timings = {}
+
+    start = time.perf_counter()
+    if interface == "wsgi":
+        from core.wsgi import application
+
+        request = wsgi_request
+    else:
+        from core.asgi import application
+
+        request = asgi_request
+    timings["setup"] = time.perf_counter() - start
+
+    for path in PATHS:
+        start = time.perf_counter()
+        request(application, path)
+        timings[path] = time.perf_counter() - start
+
+    json.dump(timings, sys.stdout)
+
+
+def main(runs=5):
+    for interface in ("wsgi", "asgi"):
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", interface],
+                check=True,
+                capture_output=True,
+                text=True,
+                cwd=BASE_DIR,
+            ).stdout
+            samples.append(json.loads(output))
+
+        print(f"{interface} (median of {runs} runs)")
+        for key in samples[0]:
+            median = statistics.median(sample[key] for sample in samples)
+            label = "django.setup()" if key == "setup" else f"first GET {key}"
+            print(f"  {label:<30} {median * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+        child(sys.argv[2])
+    else:
+        main(*map(int, sys.argv[1:2]))
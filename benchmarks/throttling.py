@@ -0,0 +1,72 @@
+"""
+Measure the per-request overhead of the throttle classes.
+
+Always uses the in-process store, so a configured THROTTLE_CACHE_ALIAS is
+never written to.
+
+Usage:
+    python benchmarks/throttling.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django
+
+django.setup()
+
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from core.throttling import (
+    ConcurrencyThrottle,
+    LocalBucketStore,
+    TokenBucketThrottle,
+)
+
+
+class BenchmarkUser:
+    pk = 1
+    is_authenticated = True
+
+
+def report(label, seconds, iterations):
+    print(f"{label:<32} {seconds / iterations * 1e9:8.0f} ns/check")
+
+
+def main(iterations=200_000):
+    request = Request(APIRequestFactory().get("/api/employees/"))
+    request.user = BenchmarkUser()
+    view = object()
+
+    store = LocalBucketStore()
+    seconds = timeit.timeit(
+        lambda: store.consume("bench", 10**9, 10**9), number=iterations
+    )
+    report("LocalBucketStore.consume", seconds, iterations)
+
+    throttle = TokenBucketThrottle()
+    seconds = timeit.timeit(
+        lambda: throttle.allow_request(request, view), number=iterations
+    )
+    report("TokenBucketThrottle", seconds, iterations)
+
+    throttle = ConcurrencyThrottle()
+
+    def check():
+        throttle.allow_request(request, view)
+        for release in request._request.__dict__.pop("_throttle_releases", ()):
+            release()
+
+    seconds = timeit.timeit(check, number=iterations)
+    report("ConcurrencyThrottle + release", seconds, iterations)
+
+
+if __name__ == "__main__":
+    with override_settings(THROTTLE_CACHE_ALIAS=None):
+        main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,228 @@
+"""
+Response compression negotiated from `Accept-Encoding`.
+
+gzip is always available; brotli (`br`) and zstd are used when the
+`brotli` and `zstandard` packages are installed. `COMPRESSION_LEVELS`
+lists the codecs in order of preference with the level used for dynamic
+responses. Streaming responses are compressed chunk by chunk, so they
+are never held in memory.
+
+A compressed representation gets its own strong ETag: the codec name is
+appended inside the quotes (`"<etag>-gzip"`) and stripped again from
+`If-None-Match`/`If-Match` before the view sees them, so views keep
+comparing against the ETags they generate.
+"""
+
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipCompressor:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+CODECS = {"gzip": GzipCompressor}
+if brotli is not None:
+    CODECS["br"] = BrotliCompressor
+if zstandard is not None:
+    CODECS["zstd"] = ZstdCompressor
+
+COMPRESSIBLE_TYPES = re.compile(
+    r"^(text/|application/([\w.+-]+\+)?(json|xml|javascript)$)"
+)
+ETAG_SUFFIX = re.compile(r'-(%s)"' % "|".join(map(re.escape, CODECS)))
+
+
+def compress(data, encoding, level):
+    compressor = CODECS[encoding](level)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks, encoding, level):
+    compressor = CODECS[encoding](level)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def compress_async_stream(chunks, encoding, level):
+    compressor = CODECS[encoding](level)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def get_levels(setting="COMPRESSION_LEVELS"):
+    """
+    Return `{encoding: level}` for the codecs in `setting` that are
+    installed, in order of preference.
+    """
+    return {
+        encoding: level
+        for encoding, level in getattr(settings, setting).items()
+        if encoding in CODECS
+    }
+
+
+def negotiate(request, encodings=None):
+    """
+    Return the preferred encoding in `encodings` (by default, every
+    available codec) that the client accepts, or None.
+    """
+    if encodings is None:
+        encodings = get_levels()
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if not header:
+        return None
+
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def tag_etag(response, encoding):
+    etag = response.get("ETag")
+    if etag and etag.endswith('"') and not ETAG_SUFFIX.search(etag):
+        response.headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best codec the client accepts.
+
+    Responses shorter than `COMPRESSION_MIN_SIZE`, responses that are not
+    text, JSON, XML or JavaScript, and responses that already have a
+    `Content-Encoding` are sent as they are. Place it above any middleware
+    that reads or modifies the response body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # The encoding of the representation the client revalidates.
+        cached_encoding = None
+        for header in ("HTTP_IF_NONE_MATCH", "HTTP_IF_MATCH"):
+            if header in request.META:
+                match = ETAG_SUFFIX.search(request.META[header])
+                if match and header == "HTTP_IF_NONE_MATCH":
+                    cached_encoding = match[1]
+                request.META[header] = ETAG_SUFFIX.sub('"', request.META[header])
+
+        response = self.get_response(request)
+
+        if response.status_code == 304:
+            if cached_encoding is not None:
+                tag_etag(response, cached_encoding)
+            return response
+
+        encoding = response.get("Content-Encoding")
+        if encoding is None:
+            encoding = self.compress(request, response)
+        if encoding in CODECS:
+            tag_etag(response, encoding)
+        return response
+
+    def compress(self, request, response):
+        """
+        Compress `response` in place. Return the encoding used, or None.
+        """
+        content_type = response.get("Content-Type", "").partition(";")[0].strip()
+        if not COMPRESSIBLE_TYPES.match(content_type):
+            return None
+
+        min_size = settings.COMPRESSION_MIN_SIZE
+        if response.streaming:
+            length = response.get("Content-Length")
+            if length is not None and int(length) < min_size:
+                return None
+        elif len(response.content) < min_size:
+            return None
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        levels = get_levels()
+        encoding = negotiate(request, levels)
+        if encoding is None:
+            return None
+
+        level = levels[encoding]
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(
+                    response.streaming_content, encoding, level
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, encoding, level
+                )
+            response.headers.pop("Content-Length", None)
+        else:
+            compressed = compress(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return None
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        response.headers["Content-Encoding"] = encoding
+        return encoding
@@ -0,0 +1,120 @@
+"""
+Views for the OpenAPI schema and its documentation UIs.
+
+The schema is generated at build time by `manage.py build_schema` and
+served from `OPENAPI_SCHEMA_FILE`, so API workers never walk the
+serializers. drf-spectacular's views are only imported when the docs UIs
+are requested, or when no prebuilt schema exists (e.g. in development).
+
+Compressed copies of the schema are made once per build, at the
+`COMPRESSION_STATIC_LEVELS`, and kept with the cached schema.
+"""
+
+import hashlib
+import os
+import sys
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import quote_etag
+from django.utils.module_loading import import_string
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_safe
+from rest_framework.schemas.inspectors import ViewInspector
+
+from .compression import compress, get_levels, negotiate
+
+
+SCHEMA_CONTENT_TYPE = "application/vnd.oai.openapi+json"
+
+_schema_cache = {}
+
+
+def lazy_view(import_path, **initkwargs):
+    """
+    Return a view that imports the class-based view at `import_path` the
+    first time it is called.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(import_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class LazyAutoSchema(ViewInspector):
+    """
+    Placeholder for `DEFAULT_SCHEMA_CLASS` that resolves to
+    `OPENAPI_SCHEMA_CLASS` only while a schema is being generated.
+
+    DRF instantiates every viewset's schema while building router URLs,
+    which would otherwise import drf-spectacular's generator in every
+    worker. Outside schema generation the placeholder is never used.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        if cls is LazyAutoSchema and "drf_spectacular.generators" in sys.modules:
+            return import_string(settings.OPENAPI_SCHEMA_CLASS)(*args, **kwargs)
+        return super().__new__(cls)
+
+
+def load_schema():
+    """
+    Return `(content, etag, variants)` for the prebuilt schema, or None if
+    it has not been built. `variants` caches compressed copies by encoding.
+    The file is re-read only when its modification time changes.
+    """
+    path = settings.OPENAPI_SCHEMA_FILE
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _schema_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.md5(content, usedforsecurity=False).hexdigest()
+        cached = _schema_cache[path] = (mtime, content, quote_etag(digest), {})
+    return cached[1:]
+
+
+def schema_etag(request):
+    schema = load_schema()
+    return schema[1] if schema else None
+
+
+generated_schema_view = lazy_view("drf_spectacular.views.SpectacularAPIView")
+
+
+@require_safe
+@cache_control(public=True, no_cache=True)
+@etag(schema_etag)
+def schema_view(request):
+    schema = load_schema()
+    if schema is None:
+        return generated_schema_view(request)
+
+    content, _, variants = schema
+    levels = get_levels("COMPRESSION_STATIC_LEVELS")
+    encoding = negotiate(request, levels)
+    if encoding is None:
+        response = HttpResponse(content, content_type=SCHEMA_CONTENT_TYPE)
+    else:
+        if encoding not in variants:
+            variants[encoding] = compress(content, encoding, levels[encoding])
+        response = HttpResponse(variants[encoding], content_type=SCHEMA_CONTENT_TYPE)
+        response.headers["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+swagger_ui_view = lazy_view(
+    "drf_spectacular.views.SpectacularSwaggerView", url_name="schema"
+)
+redoc_view = lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema")
@@ -50,12 +50,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.throttling.ThrottleReleaseMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -89,6 +91,37 @@ DATABASES = {
     }
 }
 
+# Tenant sharding
+# Tenant tables are split across TENANT_SHARD_COUNT shards (0 disables it).
+# Locally each shard is its own SQLite file; with POSTGRES_DB set, every
+# database lives in one Postgres database with a schema per shard.
+
+TENANT_SHARD_COUNT = int(os.getenv("TENANT_SHARD_COUNT", "0"))
+
+if os.getenv("POSTGRES_DB"):
+    POSTGRES = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("POSTGRES_DB"),
+        "USER": os.getenv("POSTGRES_USER", ""),
+        "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+        "HOST": os.getenv("POSTGRES_HOST", ""),
+        "PORT": os.getenv("POSTGRES_PORT", ""),
+    }
+    DATABASES["default"] = POSTGRES
+    for index in range(TENANT_SHARD_COUNT):
+        DATABASES[f"shard_{index}"] = {
+            **POSTGRES,
+            "OPTIONS": {"options": f"-c search_path=shard_{index}"},
+        }
+else:
+    for index in range(TENANT_SHARD_COUNT):
+        DATABASES[f"shard_{index}"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / f"db_shard_{index}.sqlite3",
+        }
+
+DATABASE_ROUTERS = ["core.sharding.TenantRouter"]
+
 # Authentication backends
 
 AUTHENTICATION_BACKENDS = [
@@ -140,7 +173,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # API Configuration Settings
 
 REST_FRAMEWORK = {
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_SCHEMA_CLASS": "core.schema.LazyAutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.TokenAuthentication",
     ],
@@ -149,10 +182,54 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_THROTTLE_CLASSES": [
+        "core.throttling.TokenBucketThrottle",
+        "core.throttling.ConcurrencyThrottle",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "read": "600/min",
+        "write": "120/min",
+        "bulk": "10/min",
+        "login": "10/min",
+        "concurrent": "4",
+    },
 }
 
+# Cache alias used to share throttle budgets between workers. When unset,
+# each worker process keeps its own budgets in memory.
+
+THROTTLE_CACHE_ALIAS = os.getenv("THROTTLE_CACHE_ALIAS") or None
+
+# Response compression
+# Codecs in order of preference, with the level used for dynamic responses.
+# br and zstd are skipped unless the brotli/zstandard packages are installed.
+
+COMPRESSION_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Levels for bodies compressed once and cached, such as the prebuilt schema.
+
+COMPRESSION_STATIC_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+
+# Responses smaller than this many bytes are sent uncompressed.
+
+COMPRESSION_MIN_SIZE = 1024
+
+# Directory holding the per-tenant columnar analytics snapshots.
+
+ANALYTICS_DIR = Path(os.getenv("ANALYTICS_DIR") or BASE_DIR / "analytics")
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Employee Achievement Tracker API",
     "DESCRIPTION": "API for managing employees, departments, and achievements",
     "VERSION": "1.0.0",
 }
+
+# Schema class used when generating the OpenAPI schema, and the prebuilt
+# schema written by `manage.py build_schema`
+
+OPENAPI_SCHEMA_CLASS = "employee_tracker.schema.AutoSchema"
+OPENAPI_SCHEMA_FILE = BASE_DIR / "build" / "openapi.json"
+
+# Testing
+
+TEST_RUNNER = "core.test_runner.TimedTestRunner"
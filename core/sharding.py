@@ -0,0 +1,130 @@
+"""
+Tenant sharding.
+
+With `TENANT_SHARD_COUNT` set, the tenant-owned tables (everything in
+`SHARDED_APPS` except `UNSHARDED_MODELS`) live on the `shard_<n>`
+databases, while users, tokens and other global tables stay on `default`.
+Each tenant's rows are kept together on one shard; the shard is chosen by
+a stable hash of the user id unless the tenant has been moved (or still
+lives on `default` from before sharding was enabled).
+
+Code that touches tenant tables must run with a shard active, see
+`use_shard()`. API views activate the requesting user's shard.
+"""
+
+import contextlib
+import contextvars
+import zlib
+
+from django.conf import settings
+
+SHARDED_APPS = {"employee_tracker"}
+UNSHARDED_MODELS = {("employee_tracker", "tenantplacement")}
+
+_current_shard = contextvars.ContextVar("current_shard", default=None)
+
+
+def sharding_enabled():
+    return getattr(settings, "TENANT_SHARD_COUNT", 0) > 0
+
+
+def get_shard_aliases():
+    return [f"shard_{index}" for index in range(settings.TENANT_SHARD_COUNT)]
+
+
+def hash_shard(user_id):
+    """
+    Return the shard a tenant is placed on by default. CRC32 keeps the
+    result stable across processes, unlike `hash()`.
+    """
+    aliases = get_shard_aliases()
+    return aliases[zlib.crc32(str(user_id).encode()) % len(aliases)]
+
+
+def is_sharded(app_label, model_name):
+    return (
+        app_label in SHARDED_APPS
+        and (app_label, model_name.lower()) not in UNSHARDED_MODELS
+    )
+
+
+def get_current_shard():
+    return _current_shard.get()
+
+
+def activate_shard(alias):
+    """
+    Route tenant tables to `alias` in the current context. Return a token
+    for `deactivate_shard()`.
+    """
+    return _current_shard.set(alias)
+
+
+def deactivate_shard(token):
+    _current_shard.reset(token)
+
+
+@contextlib.contextmanager
+def use_shard(alias):
+    token = activate_shard(alias)
+    try:
+        yield
+    finally:
+        deactivate_shard(token)
+
+
+class TenantRouter:
+    """
+    Route tenant tables to the active shard and keep their migrations off
+    `default`. Does nothing unless `TENANT_SHARD_COUNT` is set.
+    """
+
+    def _db_for_model(self, model, **hints):
+        if not sharding_enabled() or not is_sharded(
+            model._meta.app_label, model._meta.model_name
+        ):
+            return None
+
+        # Related lookups stay on the shard the instance was loaded from.
+        instance = hints.get("instance")
+        if (
+            instance is not None
+            and instance._state.db
+            and is_sharded(instance._meta.app_label, instance._meta.model_name)
+        ):
+            return instance._state.db
+
+        alias = get_current_shard()
+        if alias is None:
+            raise RuntimeError(
+                f"No tenant shard is active for {model._meta.label}; "
+                "wrap the code in core.sharding.use_shard()."
+            )
+        return alias
+
+    db_for_read = _db_for_model
+    db_for_write = _db_for_model
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not sharding_enabled():
+            return None
+        # Tenant rows reference users on `default` by id only.
+        sharded = {
+            is_sharded(obj._meta.app_label, obj._meta.model_name)
+            for obj in (obj1, obj2)
+        }
+        if len(sharded) == 2:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not sharding_enabled():
+            return None
+        if model_name is not None and is_sharded(app_label, model_name):
+            return db != "default"
+        if app_label in SHARDED_APPS:
+            return db == "default"
+        if db == "default":
+            return None
+        # Tenant rows reference users on `default` by id only.
+        return False
@@ -0,0 +1,165 @@
+import time
+import unittest
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.db import connections
+from django.test.runner import (
+    DiscoverRunner,
+    ParallelTestSuite,
+    RemoteTestResult,
+    RemoteTestRunner,
+)
+
+from core.throttling import LocalBucketStore, get_store
+
+
+FAST_PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def use_fast_password_hashers(*args):
+    """
+    Swap the default PBKDF2 hasher for MD5, which is insecure but makes
+    creating users in tests practically free.
+    """
+    settings.PASSWORD_HASHERS = FAST_PASSWORD_HASHERS
+    hashers.get_hashers.cache_clear()
+    hashers.get_hashers_by_algorithm.cache_clear()
+
+
+def use_local_throttle_store(*args):
+    """
+    Keep throttle budgets in process during tests, so a configured
+    `THROTTLE_CACHE_ALIAS` is never written to.
+    """
+    settings.THROTTLE_CACHE_ALIAS = None
+
+
+def use_test_shard_databases(*args):
+    """
+    Configure SQLite databases for two tenant shards if the settings define
+    fewer, so tests can move tenants between them. Their test databases are
+    only created for runs that include a test using them.
+    """
+    for index in range(2):
+        settings.DATABASES.setdefault(
+            f"shard_{index}",
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": settings.BASE_DIR / f"db_shard_{index}.sqlite3",
+            },
+        )
+    connections.configure_settings(settings.DATABASES)
+
+
+def reset_throttle_budgets():
+    """
+    Give every test full throttle budgets. Tests share user ids and the
+    client address, so they would otherwise draw from the same buckets.
+    """
+    store = get_store()
+    if isinstance(store, LocalBucketStore):
+        store.reset()
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    """
+    Record the wall-clock duration of each test, keyed by test id.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = {}
+
+    def startTest(self, test):
+        reset_throttle_budgets()
+        self._test_started_at = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.addTiming(test, time.perf_counter() - self._test_started_at)
+
+    def addTiming(self, test, elapsed):
+        self.timings[test.id()] = elapsed
+
+
+class TimedRemoteTestResult(RemoteTestResult):
+    """
+    Forward timings measured in a worker process to the parent result.
+    """
+
+    def startTest(self, test):
+        reset_throttle_budgets()
+        self._test_started_at = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        elapsed = time.perf_counter() - self._test_started_at
+        # Replayed after stopTest, so it replaces the parent's own measurement.
+        self.events.append(("addTiming", self.test_index, elapsed))
+
+
+class TimedRemoteTestRunner(RemoteTestRunner):
+    resultclass = TimedRemoteTestResult
+
+
+class TimedParallelTestSuite(ParallelTestSuite):
+    runner_class = TimedRemoteTestRunner
+
+    # Spawned workers re-import settings, so repeat the override there.
+    def process_setup(*args):
+        use_fast_password_hashers()
+        use_local_throttle_store()
+        use_test_shard_databases()
+
+
+class TimedTestRunner(DiscoverRunner):
+    """
+    Test runner that uses fast password hashing, starts every test with
+    fresh in-process throttle budgets, configures two tenant shards, and
+    reports the slowest tests once the run finishes.
+
+    Works with `manage.py test --parallel`; worker timings are sent back
+    to the parent process alongside the regular result events.
+    """
+
+    parallel_test_suite = TimedParallelTestSuite
+
+    def __init__(self, slowest=10, **kwargs):
+        super().__init__(**kwargs)
+        self.slowest = slowest
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--slowest",
+            type=int,
+            default=10,
+            metavar="N",
+            help="Report the N slowest tests (0 to disable). Defaults to 10.",
+        )
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        use_fast_password_hashers()
+        use_local_throttle_store()
+        use_test_shard_databases()
+
+    def get_resultclass(self):
+        return super().get_resultclass() or TimedTextTestResult
+
+    def suite_result(self, suite, result, **kwargs):
+        self.report_slowest(result)
+        return super().suite_result(suite, result, **kwargs)
+
+    def report_slowest(self, result):
+        timings = getattr(result, "timings", None)
+        if not self.slowest or not timings:
+            return
+        slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+        self.log(f"\nSlowest {min(self.slowest, len(slowest))} tests:")
+        for test_id, elapsed in slowest[: self.slowest]:
+            self.log(f"  {elapsed:8.3f}s  {test_id}")
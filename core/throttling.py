@@ -0,0 +1,262 @@
+import threading
+import time
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """
+    Parse a rate such as "100/min" into `(capacity, tokens_per_second)`.
+    """
+    if rate is None:
+        return None
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+class LocalBucketStore:
+    """
+    In-process token buckets and in-flight counters.
+
+    Budgets are per worker process, so the effective limit scales with the
+    number of workers. Use `CacheBucketStore` to share them.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        """
+        Take one token from the bucket at `key`.
+
+        Return 0 if the token was granted, otherwise the number of seconds
+        until one becomes available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                tokens = capacity
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / refill_rate
+            full_at = now + (capacity - tokens) / refill_rate
+            self._buckets[key] = (tokens, now, full_at)
+            return wait
+
+    def _prune(self, now):
+        # Buckets that have refilled completely carry no state worth keeping.
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+        }
+
+    def acquire(self, key, limit):
+        with self._lock:
+            count = self._in_flight.get(key, 0)
+            if count >= limit:
+                return False
+            self._in_flight[key] = count + 1
+            return True
+
+    def release(self, key):
+        with self._lock:
+            count = self._in_flight.get(key, 0) - 1
+            if count > 0:
+                self._in_flight[key] = count
+            else:
+                self._in_flight.pop(key, None)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self._in_flight.clear()
+
+
+class CacheBucketStore:
+    """
+    Token buckets and in-flight counters kept in a Django cache, shared by
+    every worker that uses the same cache.
+
+    Bucket updates are read-modify-write, so concurrent requests for the
+    same key may occasionally both be granted the last token. In-flight
+    counters use the cache's atomic `incr`/`decr`.
+
+    Unlike `LocalBucketStore` there is no `reset()`: the cache may be
+    shared with other data, which must not be cleared.
+    """
+
+    # Expire in-flight counters so a crashed worker cannot hold slots forever.
+    in_flight_timeout = 300
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.time()
+        bucket = self.cache.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0
+        else:
+            wait = (1 - tokens) / refill_rate
+        timeout = max(1, int((capacity - tokens) / refill_rate) + 1)
+        self.cache.set(key, (tokens, now), timeout)
+        return wait
+
+    def acquire(self, key, limit):
+        self.cache.add(key, 0, self.in_flight_timeout)
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # The key expired between add() and incr().
+            self.cache.add(key, 1, self.in_flight_timeout)
+            count = 1
+        if count > limit:
+            self.release(key)
+            return False
+        return True
+
+    def release(self, key):
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            pass
+
+
+_store = None
+
+
+def get_store():
+    """
+    Return the store selected by `THROTTLE_CACHE_ALIAS`, or the in-process
+    store when it is unset.
+    """
+    global _store
+    if _store is None:
+        alias = getattr(settings, "THROTTLE_CACHE_ALIAS", None)
+        _store = LocalBucketStore() if alias is None else CacheBucketStore(alias)
+    return _store
+
+
+@receiver(setting_changed)
+def reset_store(*, setting, **kwargs):
+    global _store
+    if setting == "THROTTLE_CACHE_ALIAS":
+        _store = None
+
+
+def get_ident(throttle, request):
+    user = request.user
+    if user and user.is_authenticated:
+        return f"user:{user.pk}"
+    return f"ip:{throttle.get_ident(request)}"
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Limit requests per user (or per IP for anonymous requests) with a token
+    bucket per budget.
+
+    The budget comes from the view's `throttle_scope` if set, otherwise
+    "read" for safe methods, "bulk" for writes with a list payload and
+    "write" for other writes. Rates are read from `DEFAULT_THROTTLE_RATES`;
+    a scope without a rate is not throttled.
+    """
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_scope(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope:
+            return scope
+        # Read the method from the HttpRequest directly; proxying it through
+        # the DRF request costs more than the rest of the check.
+        if request._request.method in SAFE_METHODS:
+            return "read"
+        if isinstance(request.data, list):
+            return "bulk"
+        return "write"
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+        if rate is None:
+            return True
+
+        capacity, refill_rate = rate
+        key = f"throttle:{scope}:{get_ident(self, request)}"
+        self.wait_time = get_store().consume(key, capacity, refill_rate)
+        return self.wait_time == 0
+
+    def wait(self):
+        return self.wait_time
+
+
+class ConcurrencyThrottle(BaseThrottle):
+    """
+    Cap the number of requests a user has in flight at once.
+
+    The cap is the "concurrent" entry of `DEFAULT_THROTTLE_RATES`. Slots are
+    released by `ThrottleReleaseMiddleware` once the response is returned.
+    """
+
+    def allow_request(self, request, view):
+        limit = api_settings.DEFAULT_THROTTLE_RATES.get("concurrent")
+        if limit is None:
+            return True
+
+        store = get_store()
+        key = f"throttle:concurrent:{get_ident(self, request)}"
+        if not store.acquire(key, int(limit)):
+            return False
+
+        releases = request._request.__dict__.setdefault("_throttle_releases", [])
+        releases.append(partial(store.release, key))
+        return True
+
+    def wait(self):
+        return 1
+
+
+class ThrottleReleaseMiddleware:
+    """
+    Release the in-flight slots taken by `ConcurrencyThrottle`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            for release in request.__dict__.pop("_throttle_releases", ()):
+                release()
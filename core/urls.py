@@ -17,25 +17,13 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+from core.schema import schema_view, swagger_ui_view, redoc_view
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("employee_tracker.urls")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/schema/swagger-ui/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
-    path(
-        "api/schema/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
-        name="redoc",
-    ),
+    path("api/schema/", schema_view, name="schema"),
+    path("api/schema/swagger-ui/", swagger_ui_view, name="swagger-ui"),
+    path("api/schema/redoc/", redoc_view, name="redoc"),
 ]
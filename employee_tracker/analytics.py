@@ -0,0 +1,363 @@
+"""
+Columnar snapshots of award data for reporting queries.
+
+Each tenant's live awards are materialized as one NumPy array per column
+(award, employee, department, achievement and date ordinal), saved as
+`.npy` files under `ANALYTICS_DIR/<user_id>/` and memory-mapped when
+read. Reports such as awards per department per quarter then run as
+vectorized group-bys instead of row-by-row ORM aggregation.
+
+Snapshots are refreshed incrementally: only employees whose awards,
+profile or department changed since the last refresh are re-read.
+NumPy is an optional dependency; install it to use this module.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import (
+    Achievement,
+    AchievementEmployee,
+    ArchivedDepartment,
+    ArchivedEmployee,
+    Employee,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+COLUMNS = {
+    "award": "int64",
+    "employee": "int64",
+    "department": "int64",
+    "achievement": "int64",
+    "date": "int32",
+}
+
+# Stored for awards of employees without a (live) department.
+NO_DEPARTMENT = -1
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Changes committed shortly before a refresh started may carry an older
+# `updated_at`, so each refresh also re-reads this much of the previous
+# window. Re-reading an employee is idempotent.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def require_numpy():
+    if np is None:
+        raise ImproperlyConfigured(
+            "Analytics snapshots require NumPy; install it with `pip install numpy`."
+        )
+
+
+def get_snapshot_dir(user_id):
+    return os.path.join(settings.ANALYTICS_DIR, str(user_id))
+
+
+def fetch_columns(user_id, employees=None):
+    """
+    Read the live awards of `user_id` (optionally only for the given
+    employee ids) into a dict of column arrays sorted by award id.
+    """
+    queryset = AchievementEmployee.objects.filter(
+        employee__created_by_id=user_id, employee__deleted_at__isnull=True
+    )
+    if employees is not None:
+        queryset = queryset.filter(employee_id__in=employees)
+    rows = queryset.order_by("pk").values_list(
+        "pk",
+        "employee_id",
+        Case(
+            When(
+                employee__department__deleted_at__isnull=True,
+                then=F("employee__department_id"),
+            ),
+        ),
+        "achievement_id",
+        "achievement_date",
+    )
+
+    columns = {name: [] for name in COLUMNS}
+    for award, employee, department, achievement, achievement_date in rows:
+        columns["award"].append(award)
+        columns["employee"].append(employee)
+        columns["department"].append(
+            NO_DEPARTMENT if department is None else department
+        )
+        columns["achievement"].append(achievement)
+        columns["date"].append(achievement_date.toordinal())
+    return {
+        name: np.array(values, dtype=COLUMNS[name]) for name, values in columns.items()
+    }
+
+
+def changed_employees(user_id, since):
+    """
+    Return the ids of employees whose snapshot rows may be stale: their
+    awards, profile or department changed, or they were archived.
+    """
+    employees = set(
+        Employee.all_objects.filter(created_by_id=user_id)
+        .filter(
+            Q(updated_at__gte=since)
+            | Q(department__updated_at__gte=since)
+            | Q(achievementemployee__updated_at__gte=since)
+        )
+        .values_list("pk", flat=True)
+    )
+    employees.update(
+        ArchivedEmployee.objects.filter(
+            created_by_id=user_id, archived_at__gte=since
+        ).values_list("pk", flat=True)
+    )
+    return employees
+
+
+class Snapshot:
+    """
+    A tenant's award columns, with vectorized filters and group-bys.
+
+    Columns are NumPy arrays named after `COLUMNS`; dates are proleptic
+    Gregorian ordinals (`date.toordinal()`).
+    """
+
+    def __init__(self, columns, refreshed_at=None, version=None):
+        self.columns = columns
+        self.refreshed_at = refreshed_at
+        self.version = version
+
+    @classmethod
+    def load(cls, user_id):
+        """
+        Memory-map the current snapshot of `user_id`, or return None if it
+        has not been built.
+        """
+        require_numpy()
+        path = get_snapshot_dir(user_id)
+        try:
+            with open(os.path.join(path, "current.json")) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        version = os.path.join(path, meta["version"])
+        columns = {
+            name: np.load(os.path.join(version, f"{name}.npy"), mmap_mode="r")
+            for name in COLUMNS
+        }
+        return cls(columns, parse_datetime(meta["refreshed_at"]), meta["version"])
+
+    def __len__(self):
+        return len(self.columns["award"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def filter(
+        self,
+        employee=None,
+        department=None,
+        achievement=None,
+        date_from=None,
+        date_to=None,
+    ):
+        """
+        Return a snapshot of the rows matching every given condition.
+        `employee`, `department` and `achievement` take an id or a list of
+        ids; `date_from` and `date_to` are inclusive dates.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in (
+            ("employee", employee),
+            ("department", department),
+            ("achievement", achievement),
+        ):
+            if value is not None:
+                mask &= np.isin(self.columns[name], np.atleast_1d(value))
+        if date_from is not None:
+            mask &= self.columns["date"] >= date_from.toordinal()
+        if date_to is not None:
+            mask &= self.columns["date"] <= date_to.toordinal()
+        return Snapshot(
+            {name: column[mask] for name, column in self.columns.items()},
+            self.refreshed_at,
+        )
+
+    def key(self, name):
+        """
+        Return the array for a group-by key: a column name, or `year`,
+        `quarter` or `month` of the award date.
+        """
+        if name in self.columns:
+            return self.columns[name]
+        if name not in ("year", "quarter", "month"):
+            raise ValueError(f"Unknown group-by key {name!r}.")
+        months = (
+            (self.columns["date"] - EPOCH_ORDINAL)
+            .astype("datetime64[D]")
+            .astype("datetime64[M]")
+            .astype("int64")
+        )
+        if name == "year":
+            return months // 12 + 1970
+        if name == "month":
+            return months % 12 + 1
+        return months % 12 // 3 + 1
+
+    def count_by(self, *keys):
+        """
+        Count awards per distinct combination of `keys`. Return a list of
+        `(*key_values, count)` tuples ordered by key.
+        """
+        if not keys:
+            raise ValueError("count_by() needs at least one key.")
+        if not len(self):
+            return []
+
+        # Encode each combination as one integer so a 1-D sort finds the
+        # groups; codes sort in the same order as the key tuples.
+        uniques, code = [], 0
+        for name in keys:
+            values, inverse = np.unique(self.key(name), return_inverse=True)
+            code = code * len(values) + inverse
+            uniques.append(values)
+        codes, counts = np.unique(code, return_counts=True)
+        indices = np.unravel_index(codes, [len(values) for values in uniques])
+        groups = [values[index].tolist() for values, index in zip(uniques, indices)]
+        return list(zip(*groups, counts.tolist()))
+
+    def co_occurrence(self):
+        """
+        Return `(achievement_ids, matrix)` where `matrix[i, j]` is the number
+        of employees holding both achievement `i` and achievement `j`; the
+        diagonal counts the holders of each achievement.
+        """
+        achievements, achievement_index = np.unique(
+            self.columns["achievement"], return_inverse=True
+        )
+        _, employee_index = np.unique(self.columns["employee"], return_inverse=True)
+        size = len(achievements)
+        # One code per distinct (employee, achievement), sorted by employee.
+        holdings = np.unique(employee_index.astype(np.int64) * size + achievement_index)
+        _, starts, counts = np.unique(
+            holdings // size, return_index=True, return_counts=True
+        )
+        held = holdings % size
+
+        # Pair every holding with each holding of the same employee, so
+        # memory grows with the pairs rather than employees x achievements.
+        repeats = np.repeat(counts, counts)
+        left = np.repeat(np.arange(len(held)), repeats)
+        first = np.cumsum(repeats) - repeats
+        offsets = np.arange(len(left)) - np.repeat(first, repeats)
+        right = np.repeat(np.repeat(starts, counts), repeats) + offsets
+        pairs = held[left] * size + held[right]
+        matrix = np.bincount(pairs, minlength=size * size).reshape(size, size)
+        return achievements, matrix.astype(np.int64)
+
+
+def write_pointer(user_id, snapshot):
+    """
+    Atomically point readers of `user_id` at `snapshot.version`.
+    """
+    path = get_snapshot_dir(user_id)
+    pointer = os.path.join(path, f"current.{snapshot.version}.json")
+    with open(pointer, "w") as f:
+        json.dump(
+            {
+                "version": snapshot.version,
+                "refreshed_at": snapshot.refreshed_at.isoformat(),
+            },
+            f,
+        )
+    os.replace(pointer, os.path.join(path, "current.json"))
+
+
+def save_snapshot(user_id, snapshot):
+    """
+    Write `snapshot` as a new version and switch readers to it. Readers
+    holding the previous version keep their mappings.
+    """
+    path = get_snapshot_dir(user_id)
+    version = snapshot.version = uuid.uuid4().hex
+    os.makedirs(os.path.join(path, version))
+    for name in COLUMNS:
+        np.save(os.path.join(path, version, f"{name}.npy"), snapshot[name])
+    write_pointer(user_id, snapshot)
+
+    for entry in os.listdir(path):
+        if entry != version and os.path.isdir(os.path.join(path, entry)):
+            shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+
+def build_snapshot(user_id):
+    """
+    Materialize the full snapshot of `user_id`. Return it.
+    """
+    require_numpy()
+    refreshed_at = timezone.now()
+    snapshot = Snapshot(fetch_columns(user_id), refreshed_at)
+    save_snapshot(user_id, snapshot)
+    return snapshot
+
+
+def refresh_snapshot(user_id):
+    """
+    Bring the snapshot of `user_id` up to date, re-reading only changed
+    employees. Build it in full if it does not exist. Return
+    `(snapshot, changed)`, where `changed` is the number of employees
+    re-read, or None after a full build.
+    """
+    current = Snapshot.load(user_id)
+    if current is None:
+        return build_snapshot(user_id), None
+
+    refreshed_at = timezone.now()
+    since = current.refreshed_at - REFRESH_OVERLAP
+    employees = changed_employees(user_id, since)
+
+    # Archiving a department detaches its employees without touching them.
+    departments = ArchivedDepartment.objects.filter(
+        created_by_id=user_id, archived_at__gte=since
+    ).values_list("pk", flat=True)
+    detached = current["employee"][np.isin(current["department"], list(departments))]
+    employees.update(detached.tolist())
+
+    # Awards also vanish when their achievement is deleted.
+    achievements = np.fromiter(
+        Achievement.objects.filter(created_by_id=user_id).values_list("pk", flat=True),
+        dtype="int64",
+    )
+    keep = np.isin(current["employee"], list(employees), invert=True)
+    keep &= np.isin(current["achievement"], achievements)
+    if not employees and keep.all():
+        current.refreshed_at = refreshed_at
+        write_pointer(user_id, current)
+        return current, 0
+
+    fresh = fetch_columns(user_id, employees) if employees else None
+    columns = {}
+    for name in COLUMNS:
+        column = current[name][keep]
+        if fresh is not None:
+            column = np.concatenate([column, fresh[name]])
+        columns[name] = column
+    order = np.argsort(columns["award"], kind="stable")
+    snapshot = Snapshot(
+        {name: column[order] for name, column in columns.items()}, refreshed_at
+    )
+    save_snapshot(user_id, snapshot)
+    return snapshot, len(employees)
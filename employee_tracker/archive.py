@@ -0,0 +1,120 @@
+"""
+Move soft-deleted rows out of the live tables.
+
+Rows are processed in small batches, each in its own transaction, so no
+single statement holds locks on a large part of a hot table.
+"""
+
+import time
+
+from django.db import router, transaction
+from django.utils import timezone
+
+from .models import (
+    AchievementEmployee,
+    ArchivedAchievementEmployee,
+    ArchivedDepartment,
+    ArchivedEmployee,
+    Department,
+    Employee,
+)
+
+
+def _batches(queryset, batch_size):
+    """
+    Yield lists of primary keys from `queryset` until it is exhausted.
+
+    The queryset is re-evaluated for every batch, so each batch must remove
+    its rows from the queryset's result.
+    """
+    while True:
+        pks = list(queryset.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        yield pks
+
+
+def archive_employees(deleted_before, batch_size=500, pause=0):
+    """
+    Archive employees deleted before `deleted_before`, together with their
+    awards. Return the number of employees archived.
+    """
+    archived = 0
+    queryset = Employee.all_objects.filter(deleted_at__lt=deleted_before)
+    using = router.db_for_write(Employee)
+    for pks in _batches(queryset, batch_size):
+        with transaction.atomic(using=using):
+            employees = list(Employee.all_objects.filter(pk__in=pks))
+            awards = list(AchievementEmployee.objects.filter(employee_id__in=pks))
+            ArchivedEmployee.objects.bulk_create(
+                [
+                    ArchivedEmployee(
+                        id=employee.pk,
+                        name=employee.name,
+                        email=employee.email,
+                        phone=employee.phone,
+                        address=employee.address,
+                        department_id=employee.department_id,
+                        created_by_id=employee.created_by_id,
+                        deleted_at=employee.deleted_at,
+                    )
+                    for employee in employees
+                ],
+                ignore_conflicts=True,
+            )
+            ArchivedAchievementEmployee.objects.bulk_create(
+                [
+                    ArchivedAchievementEmployee(
+                        id=award.pk,
+                        employee_id=award.employee_id,
+                        achievement_id=award.achievement_id,
+                        achievement_date=award.achievement_date,
+                    )
+                    for award in awards
+                ],
+                ignore_conflicts=True,
+            )
+            AchievementEmployee.objects.filter(employee_id__in=pks).delete()
+            Employee.all_objects.filter(pk__in=pks).hard_delete()
+        archived += len(pks)
+        time.sleep(pause)
+    return archived
+
+
+def archive_departments(deleted_before, batch_size=500, pause=0):
+    """
+    Archive departments deleted before `deleted_before`. Employees still
+    referencing them are detached in batches first. Return the number of
+    departments archived.
+    """
+    archived = 0
+    queryset = Department.all_objects.filter(deleted_at__lt=deleted_before)
+    using = router.db_for_write(Department)
+    for pks in _batches(queryset, batch_size):
+        members = Employee.all_objects.filter(department_id__in=pks)
+        for employee_pks in _batches(members, batch_size):
+            # Bump updated_at so the employees' ETags change with the
+            # department gone.
+            Employee.all_objects.filter(pk__in=employee_pks).update(
+                department=None, updated_at=timezone.now()
+            )
+            time.sleep(pause)
+
+        with transaction.atomic(using=using):
+            departments = list(Department.all_objects.filter(pk__in=pks))
+            ArchivedDepartment.objects.bulk_create(
+                [
+                    ArchivedDepartment(
+                        id=department.pk,
+                        name=department.name,
+                        created_by_id=department.created_by_id,
+                        deleted_at=department.deleted_at,
+                    )
+                    for department in departments
+                ],
+                ignore_conflicts=True,
+            )
+            Department.all_objects.filter(pk__in=pks).hard_delete()
+        archived += len(pks)
+        time.sleep(pause)
+    return archived
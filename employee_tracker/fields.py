@@ -0,0 +1,131 @@
+from collections.abc import Mapping
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+
+class IdentityMap:
+    """
+    Per-request cache of model instances keyed by primary key.
+
+    Primary keys that were looked up but not found are remembered as well,
+    so each referenced row costs at most one lookup per request.
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    def load(self, queryset, pks):
+        """
+        Fetch the `pks` not seen yet with a single query on `queryset` and
+        return the cache for its model, mapping pk to instance (or None).
+        """
+        cache = self._objects.setdefault(queryset.model, {})
+        missing = {pk for pk in pks if pk not in cache}
+        if missing:
+            for obj in queryset.filter(pk__in=missing):
+                cache[obj.pk] = obj
+            for pk in missing:
+                cache.setdefault(pk, None)
+        return cache
+
+
+def get_identity_map(context):
+    """
+    Return the identity map for the current request, or for the serializer
+    context when there is no request.
+    """
+    request = context.get("request")
+    if request is None:
+        holder = context
+    else:
+        holder = getattr(request, "_request", request).__dict__
+    return holder.setdefault("_identity_map", IdentityMap())
+
+
+def collect_references(serializer, data, references):
+    """
+    Walk `data` alongside `serializer` and gather the primary keys given to
+    every `TenantPrimaryKeyRelatedField`, grouped by model.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        if isinstance(data, list):
+            for item in data:
+                collect_references(serializer.child, item, references)
+        return
+
+    if not isinstance(serializer, serializers.Serializer) or not isinstance(
+        data, Mapping
+    ):
+        return
+
+    for field in serializer.fields.values():
+        if field.read_only or field.field_name not in data:
+            continue
+        value = data[field.field_name]
+        if isinstance(field, TenantPrimaryKeyRelatedField):
+            field.add_reference(value, references)
+        elif isinstance(field, serializers.BaseSerializer):
+            collect_references(field, value, references)
+
+
+class TenantPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key relation limited to rows created by the requesting user.
+
+    On first use, every id referenced by this kind of field anywhere in the
+    root serializer's payload (including nested and list payloads) is
+    resolved with one `IN` query per model. The instances are kept in a
+    per-request identity map, so later lookups reuse them.
+    """
+
+    def __init__(self, tenant_field="created_by", **kwargs):
+        self.tenant_field = tenant_field
+        super().__init__(**kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get("request")
+        if request is not None:
+            queryset = queryset.filter(**{self.tenant_field: request.user})
+        return queryset
+
+    def to_pk(self, data):
+        if isinstance(data, bool):
+            return None
+        try:
+            return self.get_queryset().model._meta.pk.to_python(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            return None
+
+    def add_reference(self, data, references):
+        pk = self.to_pk(data)
+        if pk is not None:
+            queryset = self.get_queryset()
+            references.setdefault(queryset.model, (queryset, set()))[1].add(pk)
+
+    def load_references(self):
+        """
+        Resolve all references in the root payload, once per root serializer.
+        """
+        root = self.root
+        if getattr(root, "_references_loaded", False):
+            return
+        root._references_loaded = True
+
+        references = {}
+        collect_references(root, getattr(root, "initial_data", None), references)
+        identity_map = get_identity_map(self.context)
+        for queryset, pks in references.values():
+            identity_map.load(queryset, pks)
+
+    def to_internal_value(self, data):
+        self.load_references()
+        pk = self.to_pk(data)
+        if pk is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        obj = get_identity_map(self.context).load(self.get_queryset(), [pk])[pk]
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        return obj
@@ -0,0 +1,55 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from core.sharding import sharding_enabled, use_shard
+from employee_tracker.analytics import build_snapshot, refresh_snapshot
+from employee_tracker.shards import get_placement
+
+
+class Command(BaseCommand):
+    help = (
+        "Build or incrementally refresh the columnar analytics snapshots of "
+        "every tenant. Intended to run periodically, e.g. from cron, or as a "
+        "long-running job with --every."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="users",
+            help="Only process this user id. Can be given more than once.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the snapshots instead of refreshing them.",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            help="Keep running, refreshing every this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        full = options["full"]
+        while True:
+            users = options["users"] or User.objects.values_list("pk", flat=True)
+            for user_id in users:
+                shard = get_placement(user_id)[0] if sharding_enabled() else None
+                with use_shard(shard):
+                    if full:
+                        snapshot, changed = build_snapshot(user_id), None
+                    else:
+                        snapshot, changed = refresh_snapshot(user_id)
+                detail = (
+                    "rebuilt" if changed is None else f"{changed} employees re-read"
+                )
+                self.stdout.write(f"User {user_id}: {len(snapshot)} awards ({detail}).")
+            if options["every"] is None:
+                return
+            full = False
+            time.sleep(options["every"])
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.sharding import sharding_enabled, use_shard
+from employee_tracker.archive import archive_departments, archive_employees
+from employee_tracker.shards import get_tenant_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "Move employees and departments deleted more than --days ago to the "
+        "archive tables. Intended to run periodically, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Archive rows deleted more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows moved per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches.",
+        )
+
+    def handle(self, *args, **options):
+        deleted_before = timezone.now() - timedelta(days=options["days"])
+        kwargs = {"batch_size": options["batch_size"], "pause": options["pause"]}
+        for shard in get_tenant_aliases() if sharding_enabled() else [None]:
+            with use_shard(shard):
+                employees = archive_employees(deleted_before, **kwargs)
+                departments = archive_departments(deleted_before, **kwargs)
+            where = f" on {shard}" if shard else ""
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Archived {employees} employees and {departments} "
+                    f"departments{where}."
+                )
+            )
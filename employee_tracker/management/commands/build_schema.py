@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema and write it to OPENAPI_SCHEMA_FILE."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            help="Write the schema here instead of OPENAPI_SCHEMA_FILE.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["file"] or settings.OPENAPI_SCHEMA_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        call_command(
+            "spectacular",
+            format="openapi-json",
+            file=str(path),
+            validate=True,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Schema written to {path}"))
@@ -0,0 +1,52 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.sharding import get_shard_aliases, sharding_enabled
+from employee_tracker.shards import (
+    has_legacy_tables,
+    pin_legacy_tenants,
+    reserve_id_range,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply migrations to the default database and every tenant shard. "
+        "On Postgres, each shard's schema is created first. Each shard's id "
+        "sequences are moved to its own id range. Users whose rows are still "
+        "on the default database from before sharding was enabled are kept "
+        "there until moved with move_tenant."
+    )
+
+    def handle(self, *args, **options):
+        aliases = ["default"]
+        if sharding_enabled():
+            aliases += get_shard_aliases()
+
+        for alias in aliases:
+            connection = connections[alias]
+            if alias != "default" and connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "CREATE SCHEMA IF NOT EXISTS %s"
+                        % connection.ops.quote_name(alias)
+                    )
+            self.stdout.write(f"Migrating {alias}")
+            call_command(
+                "migrate",
+                database=alias,
+                interactive=False,
+                verbosity=options["verbosity"],
+            )
+            if alias != "default":
+                reserve_id_range(alias)
+
+        if sharding_enabled() and has_legacy_tables():
+            reserve_id_range("default")
+            pinned = pin_legacy_tenants()
+            if pinned:
+                self.stdout.write(
+                    f"Kept {pinned} users on default; move them to a shard "
+                    "with move_tenant."
+                )
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sharding import get_shard_aliases, sharding_enabled
+from employee_tracker.shards import move_tenant
+
+
+class Command(BaseCommand):
+    help = (
+        "Move a tenant's rows to another shard while the API keeps serving "
+        "it. Writes are paused only for the final catch-up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_id", type=int)
+        parser.add_argument("shard", help="Target shard alias, e.g. shard_2.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows copied or deleted per statement.",
+        )
+        parser.add_argument(
+            "--grace",
+            type=float,
+            default=2.0,
+            help="Seconds to wait for in-flight writes after pausing them.",
+        )
+
+    def handle(self, *args, **options):
+        if not sharding_enabled():
+            raise CommandError("Sharding is disabled; set TENANT_SHARD_COUNT.")
+        if options["shard"] not in get_shard_aliases():
+            raise CommandError(f"Unknown shard {options['shard']!r}.")
+        try:
+            move_tenant(
+                options["user_id"],
+                options["shard"],
+                batch_size=options["batch_size"],
+                grace=options["grace"],
+                log=self.stdout.write,
+            )
+        except RuntimeError as e:
+            raise CommandError(e)
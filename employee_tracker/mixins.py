@@ -0,0 +1,138 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.sharding import activate_shard, deactivate_shard, sharding_enabled
+from .shards import TenantMoving, get_placement
+
+
+class TenantShardMixin:
+    """
+    Routes the view's tenant tables to the requesting user's shard.
+
+    While the tenant is being moved to another shard, unsafe requests are
+    rejected with 503 so the move can finish without losing writes.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not sharding_enabled() or not request.user.is_authenticated:
+            return
+        shard, read_only = get_placement(request.user.pk)
+        if read_only and request.method not in ("GET", "HEAD", "OPTIONS"):
+            raise TenantMoving()
+        self._shard_token = activate_shard(shard)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        token = self.__dict__.pop("_shard_token", None)
+        if token is not None:
+            deactivate_shard(token)
+        return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Adds ETag and Last-Modified validators to detail responses.
+
+    Conditional GET/HEAD requests are answered from a single lookup of the
+    object's timestamps, returning 304 without running the serializer.
+    PUT/PATCH requests honour If-Match and If-Unmodified-Since, returning
+    412 when the client's copy is stale.
+
+    `conditional_fields` lists the timestamp paths that make up the
+    representation; nested resources should include their own timestamps.
+    `conditional_counts` lists relations whose rows can disappear without
+    touching any of those timestamps, e.g. through a cascading delete;
+    their row counts are part of the ETag.
+    """
+
+    conditional_fields = ["updated_at"]
+    conditional_counts = []
+
+    def get_lookup_kwargs(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+    def get_validators(self, lock=False):
+        """
+        Return `(etag, last_modified)` for the requested object, or
+        `(None, None)` if it does not exist.
+
+        With `lock=True` the row is locked first, so the validators stay
+        current until the surrounding transaction commits.
+        """
+        try:
+            queryset = self.get_queryset().filter(**self.get_lookup_kwargs())
+            if lock:
+                queryset.select_for_update().values_list("pk", flat=True).first()
+            values = queryset.aggregate(
+                **{
+                    f"ts_{index}": Max(field)
+                    for index, field in enumerate(self.conditional_fields)
+                },
+                **{
+                    f"count_{index}": Count(field, distinct=True)
+                    for index, field in enumerate(self.conditional_counts)
+                },
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None, None
+
+        timestamps = [
+            value
+            for name, value in values.items()
+            if name.startswith("ts_") and value is not None
+        ]
+        if not timestamps:
+            return None, None
+
+        last_modified = max(timestamps)
+        counts = [value for name, value in values.items() if name.startswith("count_")]
+        key = f"{queryset.model._meta.label}:{self.get_lookup_kwargs()}"
+        digest = hashlib.md5(
+            f"{key}:{last_modified.isoformat()}:{counts}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        return quote_etag(digest), int(last_modified.timestamp())
+
+    def set_validators(self, response, etag, last_modified):
+        if etag is not None and response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            response.headers.setdefault("Last-Modified", http_date(last_modified))
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = None
+        if etag is not None:
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic(using=router.db_for_write(self.get_queryset().model)):
+            # Preconditions are only checked, and the row locked, when the
+            # client sent one.
+            if (
+                "HTTP_IF_MATCH" in request.META
+                or "HTTP_IF_UNMODIFIED_SINCE" in request.META
+            ):
+                etag, last_modified = self.get_validators(lock=True)
+                if etag is not None:
+                    response = get_conditional_response(
+                        request, etag=etag, last_modified=last_modified
+                    )
+                    if response is not None:
+                        return response
+
+            response = super().update(request, *args, **kwargs)
+
+        return self.set_validators(response, *self.get_validators())
@@ -1,39 +1,145 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
-class Department(models.Model):
+ALIVE = Q(deleted_at__isnull=True)
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def alive(self):
+        return self.filter(ALIVE)
+
+    def deleted(self):
+        return self.exclude(ALIVE)
+
+    def delete(self):
+        """
+        Mark the rows as deleted. Use `hard_delete()` to remove them.
+        """
+        now = timezone.now()
+        count = self.alive().update(deleted_at=now, updated_at=now)
+        return count, {self.model._meta.label: count}
+
+    delete.queryset_only = True
+
+    def hard_delete(self):
+        return super().delete()
+
+    hard_delete.queryset_only = True
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    Manager that only returns rows that have not been deleted.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+
+class SoftDeleteModel(models.Model):
+    """
+    Abstract model whose rows are marked as deleted instead of removed.
+
+    `objects` only sees live rows; `all_objects` sees every row. Deleted
+    rows are moved to the archive tables by `manage.py archive_deleted`.
+    """
+
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, using=None, keep_parents=False):
+        self.deleted_at = timezone.now()
+        self.save(using=using, update_fields=["deleted_at", "updated_at"])
+        return 1, {self._meta.label: 1}
+
+    def hard_delete(self, using=None, keep_parents=False):
+        return super().delete(using=using, keep_parents=keep_parents)
+
+
+class Department(SoftDeleteModel):
     """
     Represents a department in the organization.
     """
 
-    name = models.CharField(max_length=100, unique=True)
+    name = models.CharField(max_length=100)
     created_by = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="departments"
+        User,
+        on_delete=models.DO_NOTHING,
+        related_name="departments",
+        db_constraint=False,
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name"], condition=ALIVE, name="unique_live_department_name"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["created_by"], condition=ALIVE, name="department_live_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
 
-class Employee(models.Model):
+class Employee(SoftDeleteModel):
     """
     Represents an employee in the organization.
     """
 
     name = models.CharField(max_length=100)
-    email = models.EmailField(unique=True)
+    email = models.EmailField()
     phone = models.CharField(max_length=15)
     address = models.TextField()
     department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True)
     achievements = models.ManyToManyField("Achievement", through="AchievementEmployee")
     created_by = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="employees"
+        User,
+        on_delete=models.DO_NOTHING,
+        related_name="employees",
+        db_constraint=False,
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["email"], condition=ALIVE, name="unique_live_employee_email"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["created_by", "-id"], condition=ALIVE, name="employee_live_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
+    @property
+    def live_department(self):
+        """
+        The employee's department, or None if it has been deleted.
+
+        Deleting a department leaves its employees pointing at it until the
+        archiver clears the references in batches.
+        """
+        department = self.department
+        if department is None or department.deleted_at is not None:
+            return None
+        return department
+
 
 class Achievement(models.Model):
     """
@@ -42,8 +148,12 @@ class Achievement(models.Model):
 
     name = models.CharField(max_length=100, unique=True)
     created_by = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="achievements"
+        User,
+        on_delete=models.DO_NOTHING,
+        related_name="achievements",
+        db_constraint=False,
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -58,9 +168,76 @@ class AchievementEmployee(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
     achievement = models.ForeignKey(Achievement, on_delete=models.CASCADE)
     achievement_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("employee", "achievement")
 
     def __str__(self):
         return f"{self.employee.name} - {self.achievement.name}"
+
+
+class TenantPlacement(models.Model):
+    """
+    Records which shard a tenant's rows live on when it differs from the
+    default placement, or while the tenant is being moved.
+
+    Kept on the `default` database alongside the users.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="tenant_placement"
+    )
+    shard = models.CharField(max_length=50)
+    read_only = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.shard}"
+
+
+class ArchivedDepartment(models.Model):
+    """
+    A deleted department moved out of the live table by the archiver.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    created_by_id = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ArchivedEmployee(models.Model):
+    """
+    A deleted employee moved out of the live table by the archiver.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    email = models.EmailField()
+    phone = models.CharField(max_length=15)
+    address = models.TextField()
+    department_id = models.BigIntegerField(null=True)
+    created_by_id = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ArchivedAchievementEmployee(models.Model):
+    """
+    An award of an archived employee.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    employee_id = models.BigIntegerField(db_index=True)
+    achievement_id = models.BigIntegerField()
+    achievement_date = models.DateField()
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.achievement_id}"
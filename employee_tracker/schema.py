@@ -0,0 +1,57 @@
+"""
+OpenAPI annotations for the API views.
+
+This module is only imported during schema generation (it provides
+`DEFAULT_SCHEMA_CLASS`), so drf-spectacular's schema machinery stays out of
+regular API workers. Annotations are attached with view extensions rather
+than `@extend_schema` on the views themselves, because the decorator imports
+the schema class as soon as the view module is loaded.
+"""
+
+from drf_spectacular.extensions import OpenApiViewExtension
+from drf_spectacular.openapi import AutoSchema as BaseAutoSchema
+from drf_spectacular.utils import extend_schema
+from .serializers import UserSerializer, LoginSerializer
+
+
+class AutoSchema(BaseAutoSchema):
+    pass
+
+
+class RegisterViewSchema(OpenApiViewExtension):
+    target_class = "employee_tracker.views.RegisterView"
+
+    def view_replacement(self):
+        class RegisterView(self.target_class):
+            @extend_schema(request=UserSerializer, responses={201: UserSerializer})
+            def post(self, request):
+                return super().post(request)
+
+        return RegisterView
+
+
+class LoginViewSchema(OpenApiViewExtension):
+    target_class = "employee_tracker.views.LoginView"
+
+    def view_replacement(self):
+        class LoginView(self.target_class):
+            @extend_schema(
+                request=LoginSerializer,
+                responses={200: "Login successful", 401: "Invalid credentials"},
+            )
+            def post(self, request):
+                return super().post(request)
+
+        return LoginView
+
+
+class LogoutViewSchema(OpenApiViewExtension):
+    target_class = "employee_tracker.views.LogoutView"
+
+    def view_replacement(self):
+        class LogoutView(self.target_class):
+            @extend_schema(request=None, responses={200: "Logout successful"})
+            def post(self, request):
+                return super().post(request)
+
+        return LogoutView
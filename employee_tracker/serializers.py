@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Prefetch, prefetch_related_objects
+from .fields import TenantPrimaryKeyRelatedField
 from .models import Employee, Department, Achievement, AchievementEmployee
+from .shards import assign_ids
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -58,7 +61,7 @@ class AchievementEmployeeSerializer(serializers.ModelSerializer):
     """
 
     achievement = AchievementSerializer(read_only=True)
-    achievement_id = serializers.PrimaryKeyRelatedField(
+    achievement_id = TenantPrimaryKeyRelatedField(
         queryset=Achievement.objects.all(), source="achievement", write_only=True
     )
 
@@ -67,21 +70,43 @@ class AchievementEmployeeSerializer(serializers.ModelSerializer):
         fields = ["id", "achievement", "achievement_id", "achievement_date"]
 
 
+def prefetch_awards(employees):
+    """
+    Load the awards of newly created `employees`, with their achievements,
+    in one query so rendering them does not query per employee.
+    """
+    prefetch_related_objects(
+        employees,
+        Prefetch(
+            "achievementemployee_set",
+            queryset=AchievementEmployee.objects.select_related("achievement"),
+        ),
+    )
+
+
+class EmployeeListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        employees = super().create(validated_data)
+        prefetch_awards(employees)
+        return employees
+
+
 class EmployeeSerializer(serializers.ModelSerializer):
     """
     Serializer for the Employee model.
     """
 
-    department = DepartmentSerializer(read_only=True)
-    department_id = serializers.PrimaryKeyRelatedField(
+    department = DepartmentSerializer(source="live_department", read_only=True)
+    department_id = TenantPrimaryKeyRelatedField(
         queryset=Department.objects.all(), source="department", write_only=True
     )
     achievements = AchievementEmployeeSerializer(
-        source="achievementemployee_set", many=True, read_only=True
+        source="achievementemployee_set", many=True, required=False
     )
 
     class Meta:
         model = Employee
+        list_serializer_class = EmployeeListSerializer
         fields = [
             "id",
             "name",
@@ -93,17 +118,36 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "achievements",
         ]
 
+    def validate_achievements(self, value):
+        achievements = [award["achievement"] for award in value]
+        if len(achievements) != len(set(achievements)):
+            raise serializers.ValidationError(
+                "Each achievement can only be awarded once."
+            )
+        return value
+
     def create(self, validated_data):
-        achievements_data = self.context["request"].data.get("achievements", [])
+        achievements_data = validated_data.pop("achievementemployee_set", [])
         employee = Employee.objects.create(**validated_data)
-        for achievement_data in achievements_data:
-            AchievementEmployee.objects.create(employee=employee, **achievement_data)
+        self.create_achievements(employee, achievements_data)
+        if not isinstance(self.parent, serializers.ListSerializer):
+            prefetch_awards([employee])
         return employee
 
     def update(self, instance, validated_data):
-        achievements_data = self.context["request"].data.get("achievements", [])
+        # Awards are only replaced when the payload includes them, so a
+        # partial update of other fields keeps them.
+        achievements_data = validated_data.pop("achievementemployee_set", None)
         instance = super().update(instance, validated_data)
-        instance.achievementemployee_set.all().delete()
-        for achievement_data in achievements_data:
-            AchievementEmployee.objects.create(employee=instance, **achievement_data)
+        if achievements_data is not None:
+            instance.achievementemployee_set.all().delete()
+            self.create_achievements(instance, achievements_data)
         return instance
+
+    def create_achievements(self, employee, achievements_data):
+        awards = [
+            AchievementEmployee(employee=employee, **achievement_data)
+            for achievement_data in achievements_data
+        ]
+        assign_ids(awards, employee._state.db)
+        AchievementEmployee.objects.bulk_create(awards)
@@ -0,0 +1,454 @@
+"""
+Tenant placement and online moves between shards.
+"""
+
+import contextlib
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from core.sharding import get_shard_aliases, hash_shard, sharding_enabled
+from .models import (
+    Achievement,
+    AchievementEmployee,
+    ArchivedAchievementEmployee,
+    ArchivedDepartment,
+    ArchivedEmployee,
+    Department,
+    Employee,
+    TenantPlacement,
+)
+
+
+class TenantMoving(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Your data is being moved; writes are paused. Try again shortly."
+    default_code = "tenant_moving"
+
+
+def get_placement(user_id):
+    """
+    Return `(shard, read_only)` for a tenant.
+    """
+    placement = (
+        TenantPlacement.objects.using("default")
+        .filter(user_id=user_id)
+        .values_list("shard", "read_only")
+        .first()
+    )
+    return placement or (hash_shard(user_id), False)
+
+
+# Ids on shard n start at n * SHARD_ID_SPACING, so rows keep their ids when
+# a tenant is moved and never collide with the target shard's own rows.
+SHARD_ID_SPACING = 2**40
+
+# Tenants whose rows were on `default` before sharding was enabled stay
+# there until moved. New rows on `default` take ids from this range, far
+# past those of any shard added later.
+DEFAULT_ID_RANGE = 2**22
+
+
+# Tenant tables whose ids come from a sequence.
+SEQUENCED_MODELS = (Department, Achievement, Employee, AchievementEmployee)
+
+
+def get_id_range(alias):
+    if alias == "default":
+        index = DEFAULT_ID_RANGE
+    else:
+        index = get_shard_aliases().index(alias)
+    start = index * SHARD_ID_SPACING
+    return start, start + SHARD_ID_SPACING
+
+
+def has_legacy_tables():
+    """
+    Return whether `default` still has the tenant tables, i.e. the install
+    predates sharding.
+    """
+    table = Department._meta.db_table
+    return table in connections["default"].introspection.table_names()
+
+
+def get_next_id(model, alias):
+    """
+    Return the next id `model` should get on `alias`: past its sequence and
+    every row in the shard's own id range. Ids copied in from other shards
+    are ignored.
+    """
+    start, end = get_id_range(alias)
+    connection = connections[alias]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = %s", [table])
+            row = cursor.fetchone()
+            last = row[0] if row else 0
+        elif connection.vendor == "postgresql":
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+            (sequence,) = cursor.fetchone()
+            cursor.execute(f"SELECT last_value, is_called FROM {sequence}")
+            last_value, is_called = cursor.fetchone()
+            last = last_value if is_called else last_value - 1
+        else:
+            raise NotImplementedError(
+                f"Cannot read id sequences on {connection.vendor}."
+            )
+    current = (
+        model._base_manager.using(alias)
+        .filter(pk__gte=start, pk__lt=end)
+        .aggregate(id=Max("pk"))["id"]
+    )
+    ids = [start, current or 0]
+    if start <= last < end:
+        ids.append(last)
+    return max(ids) + 1
+
+
+def set_next_id(model, alias, next_id):
+    connection = connections[alias]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name = %s", [table])
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)",
+                [table, next_id - 1],
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, false)",
+                [table, next_id],
+            )
+        else:
+            raise NotImplementedError(
+                f"Cannot reserve id ranges on {connection.vendor}."
+            )
+
+
+def reserve_id_range(alias):
+    """
+    Point the id sequences of the tenant tables on `alias` into its own id
+    range, past any ids in it still used on `default` from before sharding.
+    Sequences already inside the range are never moved back.
+    """
+    start, end = get_id_range(alias)
+    legacy = alias != "default" and has_legacy_tables()
+    for model in SEQUENCED_MODELS:
+        next_id = get_next_id(model, alias)
+        if legacy:
+            current = (
+                model._base_manager.using("default")
+                .filter(pk__gte=start, pk__lt=end)
+                .aggregate(id=Max("pk"))["id"]
+            )
+            next_id = max(next_id, (current or 0) + 1)
+        set_next_id(model, alias, next_id)
+
+
+def uses_id_allocation(alias):
+    """
+    SQLite gives new rows ids past the largest one in the table, so once a
+    shard holds rows copied from a higher range its own rows would follow
+    them. SQLite shards therefore hand out ids explicitly.
+    """
+    return (
+        sharding_enabled()
+        and alias in get_shard_aliases()
+        and connections[alias].vendor == "sqlite"
+    )
+
+
+def assign_ids(objs, alias):
+    """
+    Give the unsaved `objs` (of one sequenced model) ids from the id range
+    of `alias` where the database would not.
+    """
+    objs = [obj for obj in objs if obj.pk is None]
+    if not objs or not uses_id_allocation(alias):
+        return
+    model = type(objs[0])
+    with transaction.atomic(using=alias):
+        next_id = get_next_id(model, alias)
+        set_next_id(model, alias, next_id + len(objs))
+    for offset, obj in enumerate(objs):
+        obj.pk = next_id + offset
+
+
+# Tenant tables in the order rows must be copied in, with the filter that
+# selects one tenant's rows.
+TENANT_TABLES = [
+    (Department, lambda user_id: Q(created_by_id=user_id)),
+    (Achievement, lambda user_id: Q(created_by_id=user_id)),
+    (Employee, lambda user_id: Q(created_by_id=user_id)),
+    (AchievementEmployee, lambda user_id: Q(employee__created_by_id=user_id)),
+    (ArchivedDepartment, lambda user_id: Q(created_by_id=user_id)),
+    (ArchivedEmployee, lambda user_id: Q(created_by_id=user_id)),
+    (
+        ArchivedAchievementEmployee,
+        lambda user_id: Q(
+            employee_id__in=ArchivedEmployee.objects.filter(
+                created_by_id=user_id
+            ).values("pk")
+        ),
+    ),
+]
+
+
+def pin_legacy_tenants():
+    """
+    Place every user with tenant rows still on `default` there, so they
+    keep being served until moved to a shard. Return the number of users
+    placed.
+    """
+    if not has_legacy_tables():
+        return 0
+    user_ids = set()
+    for model in (
+        Department,
+        Achievement,
+        Employee,
+        ArchivedDepartment,
+        ArchivedEmployee,
+    ):
+        user_ids.update(
+            model._base_manager.using("default")
+            .values_list("created_by_id", flat=True)
+            .distinct()
+        )
+    placed = TenantPlacement.objects.using("default").values_list("user_id")
+    users = User.objects.using("default").filter(pk__in=user_ids).exclude(pk__in=placed)
+    placements = TenantPlacement.objects.using("default").bulk_create(
+        TenantPlacement(user_id=user_id, shard="default")
+        for user_id in users.values_list("pk", flat=True)
+    )
+    return len(placements)
+
+
+def get_tenant_aliases():
+    """
+    Return every database holding tenant rows: the shards, plus `default`
+    while users are still placed there.
+    """
+    aliases = get_shard_aliases()
+    if TenantPlacement.objects.using("default").filter(shard="default").exists():
+        aliases.append("default")
+    return aliases
+
+
+def tenant_rows(model, condition, user_id, alias):
+    return model._base_manager.using(alias).filter(condition(user_id))
+
+
+@contextlib.contextmanager
+def raw_timestamps(model):
+    """
+    Save `model` rows with the `auto_now`/`auto_now_add` values they carry.
+
+    Fields are shared by the whole process, so only use this outside of
+    request handling, e.g. in management commands.
+    """
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def copy_rows(queryset, owned, target, batch_size):
+    """
+    Copy the rows of `queryset` to `target` in primary key order, keeping
+    their ids and timestamps. Return the number of rows copied.
+
+    Rows the tenant already has on `target` (`owned`) are updated. An id
+    held by any other row there raises RuntimeError; it is never
+    overwritten.
+    """
+    model = queryset.model
+    fields = [
+        field.name for field in model._meta.concrete_fields if not field.primary_key
+    ]
+    manager = model._base_manager.using(target)
+    sequenced = model in SEQUENCED_MODELS
+    if sequenced:
+        next_id = get_next_id(model, target)
+    copied = 0
+    last_pk = None
+    try:
+        with raw_timestamps(model):
+            while True:
+                batch = queryset.order_by("pk")
+                if last_pk is not None:
+                    batch = batch.filter(pk__gt=last_pk)
+                rows = list(batch[:batch_size])
+                if not rows:
+                    return copied
+                pks = [row.pk for row in rows]
+                with transaction.atomic(using=target):
+                    taken = set(manager.filter(pk__in=pks).values_list("pk", flat=True))
+                    existing = set(
+                        owned.filter(pk__in=pks).values_list("pk", flat=True)
+                    )
+                    if taken - existing:
+                        raise RuntimeError(
+                            f"{model._meta.label} ids {sorted(taken - existing)} "
+                            f"are taken by another tenant on {target}."
+                        )
+                    manager.bulk_create([row for row in rows if row.pk not in taken])
+                    manager.bulk_update(
+                        [row for row in rows if row.pk in existing], fields
+                    )
+                copied += len(rows)
+                last_pk = rows[-1].pk
+    finally:
+        # Inserting explicit ids moves SQLite sequences past them, into the
+        # id range of another shard.
+        if sequenced:
+            set_next_id(model, target, max(next_id, get_next_id(model, target)))
+
+
+def sync_tenant(user_id, source, target, batch_size, since=None):
+    """
+    Copy a tenant's rows from `source` to `target`. With `since`, only rows
+    updated or archived after it are copied (plus the awards of changed
+    employees). Return the number of rows copied.
+    """
+    copied = 0
+    changed = {}
+    for model, condition in TENANT_TABLES:
+        queryset = tenant_rows(model, condition, user_id, source)
+        owned = tenant_rows(model, condition, user_id, target)
+        if since is not None:
+            if model is AchievementEmployee:
+                # Updating an employee replaces its awards, so resync them all.
+                employees = changed[Employee]
+                owned.filter(employee_id__in=employees)._raw_delete(target)
+                queryset = queryset.filter(
+                    Q(updated_at__gte=since) | Q(employee_id__in=employees)
+                )
+            elif model is ArchivedAchievementEmployee:
+                queryset = queryset.filter(employee_id__in=changed[ArchivedEmployee])
+            elif hasattr(model, "archived_at"):
+                queryset = queryset.filter(archived_at__gte=since)
+            else:
+                queryset = queryset.filter(updated_at__gte=since)
+            if model in (Employee, ArchivedEmployee):
+                changed[model] = list(queryset.values_list("pk", flat=True))
+        copied += copy_rows(queryset, owned, target, batch_size)
+    return copied
+
+
+def delete_missing(user_id, source, target, batch_size):
+    """
+    Delete rows from `target` that no longer exist on `source`, e.g. awards
+    replaced or achievements deleted during the move.
+    """
+    for model, condition in reversed(TENANT_TABLES):
+        source_pks = set(
+            tenant_rows(model, condition, user_id, source).values_list("pk", flat=True)
+        )
+        target_pks = set(
+            tenant_rows(model, condition, user_id, target).values_list("pk", flat=True)
+        )
+        stale = sorted(target_pks - source_pks)
+        for start in range(0, len(stale), batch_size):
+            model._base_manager.using(target).filter(
+                pk__in=stale[start : start + batch_size]
+            )._raw_delete(target)
+
+
+def delete_tenant(user_id, alias, batch_size):
+    """
+    Remove a tenant's rows from `alias` in batches, children first.
+    """
+    for model, condition in reversed(TENANT_TABLES):
+        queryset = tenant_rows(model, condition, user_id, alias)
+        while True:
+            pks = list(
+                queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            model._base_manager.using(alias).filter(pk__in=pks)._raw_delete(alias)
+
+
+# A write stamps `updated_at` when it saves a row but may commit later, after
+# a catch-up pass has read the table. Each pass therefore re-reads this much
+# (plus the grace period) before the previous one started; it must cover the
+# longest write transaction. Re-copying a row is idempotent.
+CATCH_UP_OVERLAP = timedelta(seconds=30)
+
+
+def move_tenant(user_id, target, batch_size=500, grace=2.0, log=print):
+    """
+    Move a tenant's rows to the `target` shard while it keeps serving.
+
+    1. Copy every row while the tenant stays writable.
+    2. Copy rows changed since the previous pass until few changes remain.
+    3. Pause the tenant's writes, wait `grace` seconds for in-flight
+       requests, then copy the remaining changes and drop deleted rows.
+    4. Switch the tenant's placement to `target`, resume writes, and delete
+       the rows left on the old shard.
+
+    A write still running `grace` seconds after writes are paused is lost,
+    so `grace` must be longer than the slowest write request.
+    """
+    source, read_only = get_placement(user_id)
+    if source == target:
+        log(f"Tenant {user_id} is already on {target}.")
+        return
+    if read_only:
+        raise RuntimeError(f"Tenant {user_id} is already being moved.")
+
+    placement, _ = TenantPlacement.objects.using("default").update_or_create(
+        user_id=user_id, defaults={"shard": source, "read_only": False}
+    )
+
+    overlap = CATCH_UP_OVERLAP + timedelta(seconds=grace)
+    try:
+        started = timezone.now()
+        copied = sync_tenant(user_id, source, target, batch_size)
+        log(f"Copied {copied} rows from {source} to {target}.")
+
+        while True:
+            since, started = started - overlap, timezone.now()
+            copied = sync_tenant(user_id, source, target, batch_size, since=since)
+            log(f"Copied {copied} changed rows.")
+            if copied <= batch_size:
+                break
+
+        placement.read_only = True
+        placement.save(using="default", update_fields=["read_only"])
+        time.sleep(grace)
+        copied = sync_tenant(
+            user_id, source, target, batch_size, since=started - overlap
+        )
+        with transaction.atomic(using=target):
+            delete_missing(user_id, source, target, batch_size)
+        log(f"Copied {copied} changed rows with writes paused.")
+        placement.shard = target
+    except BaseException:
+        # E.g. a name already taken on the target shard: leave the tenant
+        # where it was and drop the partial copy.
+        delete_tenant(user_id, target, batch_size)
+        raise
+    finally:
+        placement.read_only = False
+        placement.save(using="default", update_fields=["shard", "read_only"])
+
+    delete_tenant(user_id, source, batch_size)
+    log(f"Tenant {user_id} moved to {target}.")
@@ -0,0 +1,24 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import pre_delete, pre_save
+from django.dispatch import receiver
+
+from core.sharding import sharding_enabled
+from .shards import SEQUENCED_MODELS, assign_ids, delete_tenant, get_tenant_aliases
+
+
+@receiver(pre_save)
+def assign_shard_id(sender, instance, raw, using, **kwargs):
+    if sender in SEQUENCED_MODELS and not raw:
+        assign_ids([instance], using)
+
+
+@receiver(pre_delete, sender=User)
+def delete_tenant_rows(sender, instance, using, **kwargs):
+    """
+    Delete a user's tenant rows, which `created_by` does not cascade to:
+    with sharding they live on other databases. Every shard is cleared, so
+    rows left behind by an interrupted move go too.
+    """
+    aliases = get_tenant_aliases() if sharding_enabled() else [using]
+    for alias in aliases:
+        delete_tenant(instance.pk, alias, batch_size=500)
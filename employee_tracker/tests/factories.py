@@ -0,0 +1,56 @@
+import itertools
+
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from employee_tracker.models import (
+    Department,
+    Employee,
+    Achievement,
+    AchievementEmployee,
+)
+
+
+_sequence = itertools.count(1)
+
+
+def create_user(username=None, password="12345", **kwargs):
+    """Create a user with a unique username and email."""
+    n = next(_sequence)
+    username = username or f"user{n}"
+    kwargs.setdefault("email", f"{username}@example.com")
+    return User.objects.create_user(username=username, password=password, **kwargs)
+
+
+def create_token(user):
+    return Token.objects.create(user=user)
+
+
+def create_department(created_by, name=None):
+    return Department.objects.create(
+        name=name or f"Department {next(_sequence)}", created_by=created_by
+    )
+
+
+def create_achievement(created_by, name=None):
+    return Achievement.objects.create(
+        name=name or f"Achievement {next(_sequence)}", created_by=created_by
+    )
+
+
+def create_employee(created_by, department=None, **kwargs):
+    n = next(_sequence)
+    kwargs.setdefault("name", f"Employee {n}")
+    kwargs.setdefault("email", f"employee{n}@example.com")
+    kwargs.setdefault("phone", "1234567890")
+    kwargs.setdefault("address", "123 Main St")
+    return Employee.objects.create(
+        department=department, created_by=created_by, **kwargs
+    )
+
+
+def award(employee, achievement, achievement_date="2023-01-01"):
+    return AchievementEmployee.objects.create(
+        employee=employee,
+        achievement=achievement,
+        achievement_date=achievement_date,
+    )
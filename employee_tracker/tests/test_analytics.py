@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from employee_tracker import analytics
+from employee_tracker.analytics import NO_DEPARTMENT, Snapshot
+from employee_tracker.tests import factories
+
+
+@unittest.skipIf(analytics.np is None, "NumPy is not installed")
+class AnalyticsSnapshotTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = factories.create_user(username="testuser")
+        cls.sales = factories.create_department(cls.user, name="Sales")
+        cls.support = factories.create_department(cls.user, name="Support")
+        cls.gold = factories.create_achievement(cls.user, name="Gold")
+        cls.silver = factories.create_achievement(cls.user, name="Silver")
+        cls.alice = factories.create_employee(cls.user, cls.sales)
+        cls.bob = factories.create_employee(cls.user, cls.sales)
+        cls.carol = factories.create_employee(cls.user, cls.support)
+        factories.award(cls.alice, cls.gold, "2024-01-15")
+        factories.award(cls.alice, cls.silver, "2024-05-01")
+        factories.award(cls.bob, cls.gold, "2024-02-20")
+        factories.award(cls.carol, cls.silver, "2024-11-30")
+
+        other = factories.create_user(username="otheruser")
+        factories.award(
+            factories.create_employee(other), factories.create_achievement(other)
+        )
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        override = override_settings(ANALYTICS_DIR=tmpdir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_count_by_department_quarter(self):
+        """Test awards per department per quarter from a built snapshot."""
+        analytics.build_snapshot(self.user.pk)
+        snapshot = Snapshot.load(self.user.pk)
+        self.assertEqual(len(snapshot), 4)
+        self.assertEqual(
+            snapshot.count_by("department", "year", "quarter"),
+            [
+                (self.sales.pk, 2024, 1, 2),
+                (self.sales.pk, 2024, 2, 1),
+                (self.support.pk, 2024, 4, 1),
+            ],
+        )
+
+    def test_filter(self):
+        """Test that filters combine ids and inclusive date bounds."""
+        snapshot = analytics.build_snapshot(self.user.pk).filter(
+            achievement=[self.gold.pk], date_to=date(2024, 1, 15)
+        )
+        self.assertEqual(snapshot.count_by("employee"), [(self.alice.pk, 1)])
+
+    def test_co_occurrence(self):
+        """Test that co-occurrence counts employees holding both achievements."""
+        achievements, matrix = analytics.build_snapshot(self.user.pk).co_occurrence()
+        self.assertEqual(list(achievements), [self.gold.pk, self.silver.pk])
+        self.assertEqual(matrix.tolist(), [[2, 1], [1, 2]])
+
+    @mock.patch.object(analytics, "REFRESH_OVERLAP", timedelta(0))
+    def test_refresh_changed_rows(self):
+        """Test that a refresh re-reads only the employees that changed."""
+        analytics.build_snapshot(self.user.pk)
+
+        snapshot, changed = analytics.refresh_snapshot(self.user.pk)
+        self.assertEqual(changed, 0)
+
+        factories.award(self.carol, self.gold, "2024-12-01")
+        self.bob.delete()
+        self.sales.delete()
+        snapshot, changed = analytics.refresh_snapshot(self.user.pk)
+        self.assertEqual(changed, 3)
+        self.assertEqual(
+            snapshot.count_by("department", "employee"),
+            [(NO_DEPARTMENT, self.alice.pk, 2), (self.support.pk, self.carol.pk, 2)],
+        )
+        self.assertEqual(
+            Snapshot.load(self.user.pk).count_by("employee"),
+            snapshot.count_by("employee"),
+        )
+
+    @mock.patch.object(analytics, "REFRESH_OVERLAP", timedelta(0))
+    def test_refresh_deleted_achievement(self):
+        """Test that awards of deleted achievements leave the snapshot."""
+        analytics.build_snapshot(self.user.pk)
+        self.silver.delete()
+        snapshot, changed = analytics.refresh_snapshot(self.user.pk)
+        self.assertEqual(changed, 0)
+        self.assertEqual(snapshot.count_by("achievement"), [(self.gold.pk, 2)])
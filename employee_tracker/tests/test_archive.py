@@ -0,0 +1,64 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from employee_tracker.archive import archive_departments, archive_employees
+from employee_tracker.models import (
+    AchievementEmployee,
+    ArchivedAchievementEmployee,
+    ArchivedDepartment,
+    ArchivedEmployee,
+    Department,
+    Employee,
+)
+from employee_tracker.tests import factories
+
+
+class ArchiveTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = factories.create_user(username="testuser")
+        cls.department = factories.create_department(cls.user)
+        cls.achievement = factories.create_achievement(cls.user)
+        cls.employees = [
+            factories.create_employee(cls.user, cls.department) for _ in range(5)
+        ]
+        for employee in cls.employees:
+            factories.award(employee, cls.achievement)
+
+    def test_archive_employees(self):
+        """Test that old deleted employees and their awards are archived in batches."""
+        Employee.objects.filter(pk__in=[e.pk for e in self.employees[:3]]).delete()
+        Employee.all_objects.filter(pk=self.employees[0].pk).update(
+            deleted_at=timezone.now() - timedelta(days=1)
+        )
+        Employee.all_objects.filter(pk=self.employees[1].pk).update(
+            deleted_at=timezone.now() - timedelta(days=1)
+        )
+
+        archived = archive_employees(timezone.now() - timedelta(hours=1), batch_size=1)
+
+        self.assertEqual(archived, 2)
+        self.assertEqual(Employee.all_objects.count(), 3)
+        self.assertEqual(
+            set(ArchivedEmployee.objects.values_list("pk", flat=True)),
+            {self.employees[0].pk, self.employees[1].pk},
+        )
+        self.assertEqual(ArchivedAchievementEmployee.objects.count(), 2)
+        self.assertEqual(AchievementEmployee.objects.count(), 3)
+
+    def test_archive_departments(self):
+        """Test that archiving a department detaches its employees first."""
+        self.department.delete()
+        deleted_at = Department.all_objects.get(pk=self.department.pk).updated_at
+
+        archived = archive_departments(timezone.now(), batch_size=2)
+
+        self.assertEqual(archived, 1)
+        self.assertFalse(Department.all_objects.exists())
+        self.assertTrue(
+            ArchivedDepartment.objects.filter(pk=self.department.pk).exists()
+        )
+        self.assertFalse(Employee.objects.filter(department__isnull=False).exists())
+        self.assertEqual(Employee.objects.count(), 5)
+        # Detached employees look modified, so cached copies are revalidated.
+        self.assertFalse(Employee.objects.filter(updated_at__lt=deleted_at).exists())
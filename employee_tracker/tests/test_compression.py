@@ -0,0 +1,126 @@
+import gzip
+import json
+import unittest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.compression import CODECS, CompressionMiddleware, negotiate
+from employee_tracker.tests import factories
+
+
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, **headers):
+        request = self.factory.get("/", **headers)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiate(self):
+        """Test that the preferred codec with a non-zero quality is chosen."""
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="br;q=0, gzip")
+        self.assertEqual(negotiate(request, ["br", "gzip"]), "gzip")
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="identity")
+        self.assertIsNone(negotiate(request, ["br", "gzip"]))
+
+    def test_compress_response(self):
+        """Test that a large JSON response is gzipped and varies on encoding."""
+        body = json.dumps([{"name": "Employee"}] * 200).encode()
+        response = self.process(
+            HttpResponse(body, content_type="application/json"),
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content), body)
+
+    def test_skip_small_response(self):
+        """Test that responses below COMPRESSION_MIN_SIZE are sent as they are."""
+        response = self.process(
+            HttpResponse(b'{"id": 1}', content_type="application/json"),
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.content, b'{"id": 1}')
+
+    def test_compress_streaming_response(self):
+        """Test that streaming bodies are compressed without being buffered."""
+        consumed = []
+
+        def chunks():
+            for i in range(100):
+                consumed.append(i)
+                yield json.dumps({"id": i}).encode() * 50
+
+        response = self.process(
+            StreamingHttpResponse(chunks(), content_type="application/json"),
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(consumed, [])
+
+        content = response.getvalue()
+        expected = b"".join(json.dumps({"id": i}).encode() * 50 for i in range(100))
+        self.assertEqual(gzip.decompress(content), expected)
+
+    @unittest.skipUnless("br" in CODECS, "brotli is not installed")
+    def test_brotli(self):
+        """Test that brotli is used when the client prefers it."""
+        import brotli
+
+        body = b"x" * 4096
+        response = self.process(
+            HttpResponse(body, content_type="text/plain"),
+            HTTP_ACCEPT_ENCODING="gzip;q=0.5, br",
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), body)
+
+    @unittest.skipUnless("zstd" in CODECS, "zstandard is not installed")
+    def test_zstd(self):
+        """Test that zstd is used when the client accepts it."""
+        import zstandard
+
+        body = b"x" * 4096
+        response = self.process(
+            HttpResponse(body, content_type="text/plain"),
+            HTTP_ACCEPT_ENCODING="zstd",
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "zstd")
+        decompressor = zstandard.ZstdDecompressor()
+        self.assertEqual(
+            decompressor.decompressobj().decompress(response.content), body
+        )
+
+
+@override_settings(COMPRESSION_MIN_SIZE=0)
+class CompressedConditionalTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = factories.create_user(username="testuser")
+        cls.token = factories.create_token(cls.user)
+        cls.employee = factories.create_employee(cls.user)
+
+    def setUp(self):
+        self.client = APIClient(HTTP_ACCEPT_ENCODING="gzip")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("employee-detail", kwargs={"pk": self.employee.id})
+
+    def test_etag_names_encoding(self):
+        """Test that compressed responses get their own ETag and revalidate."""
+        etag = self.client.get(self.url).headers["ETag"]
+        self.assertTrue(etag.endswith('-gzip"'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_if_match_compressed_etag(self):
+        """Test that If-Match accepts the ETag of a compressed response."""
+        etag = self.client.get(self.url).headers["ETag"]
+        response = self.client.patch(
+            self.url, {"name": "John Updated"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
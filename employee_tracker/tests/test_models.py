@@ -1,32 +1,30 @@
 from django.test import TestCase
 from django.db import transaction
 from django.db.utils import IntegrityError
-from django.contrib.auth.models import User
 from employee_tracker.models import (
     Department,
     Employee,
-    Achievement,
     AchievementEmployee,
 )
+from employee_tracker.tests import factories
 
 
 class ModelTestCase(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create initial objects for testing."""
 
-        self.user = User.objects.create_user(username="testuser", password="12345")
+        cls.user = factories.create_user(username="testuser")
 
-        self.department = Department.objects.create(name="IT", created_by=self.user)
-        self.employee = Employee.objects.create(
+        cls.department = factories.create_department(cls.user, name="IT")
+        cls.employee = factories.create_employee(
+            cls.user,
+            cls.department,
             name="John Doe",
             email="john@example.com",
-            phone="1234567890",
-            address="123 Main St",
-            department=self.department,
-            created_by=self.user,
         )
-        self.achievement = Achievement.objects.create(
-            name="Employee of the Month", created_by=self.user
+        cls.achievement = factories.create_achievement(
+            cls.user, name="Employee of the Month"
         )
 
     def test_department_creation(self):
@@ -73,3 +71,19 @@ class ModelTestCase(TestCase):
                     department=self.department,
                     created_by=self.user,
                 )
+
+    def test_soft_delete(self):
+        """Test that deleting an Employee hides it without removing the row."""
+        self.employee.delete()
+        self.assertFalse(Employee.objects.filter(pk=self.employee.pk).exists())
+        self.assertTrue(Employee.all_objects.filter(pk=self.employee.pk).exists())
+
+        # The email can be reused once the previous employee is deleted.
+        factories.create_employee(self.user, email="john@example.com")
+
+    def test_soft_delete_department(self):
+        """Test that deleting a Department leaves its employees in place."""
+        Department.objects.filter(pk=self.department.pk).delete()
+        employee = Employee.objects.get(pk=self.employee.pk)
+        self.assertEqual(employee.department_id, self.department.pk)
+        self.assertIsNone(employee.live_department)
@@ -0,0 +1,64 @@
+import contextlib
+import gzip
+import io
+import json
+import tempfile
+from pathlib import Path
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+
+class SchemaTestCase(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.schema_file = Path(tmpdir.name) / "openapi.json"
+        override = override_settings(OPENAPI_SCHEMA_FILE=self.schema_file)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_build_schema(self):
+        """Test that build_schema writes the OpenAPI schema to the configured file."""
+        # drf-spectacular reports generator warnings straight to stderr.
+        with contextlib.redirect_stderr(io.StringIO()):
+            call_command("build_schema", stdout=io.StringIO())
+        schema = json.loads(self.schema_file.read_text())
+        self.assertIn("/api/employees/", schema["paths"])
+
+    def test_serve_prebuilt_schema(self):
+        """Test that the prebuilt schema is served with an ETag and revalidated."""
+        self.schema_file.write_text('{"openapi": "3.0.3"}')
+        url = reverse("schema")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b'{"openapi": "3.0.3"}')
+        self.assertIn("ETag", response.headers)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response.headers["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_serve_compressed_schema(self):
+        """Test that the prebuilt schema is served from a cached gzip copy."""
+        content = json.dumps({"openapi": "3.0.3", "paths": {}}).encode()
+        self.schema_file.write_bytes(content)
+        url = reverse("schema")
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), content)
+
+        etag = response.headers["ETag"]
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_serve_generated_schema(self):
+        """Test that the schema is generated on demand when it has not been built."""
+        with contextlib.redirect_stderr(io.StringIO()):
+            response = self.client.get(
+                reverse("schema"), HTTP_ACCEPT="application/json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("/api/employees/", response.json()["paths"])
@@ -0,0 +1,326 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.sharding import TenantRouter, hash_shard, use_shard
+from employee_tracker.models import (
+    Achievement,
+    AchievementEmployee,
+    ArchivedEmployee,
+    Department,
+    Employee,
+    TenantPlacement,
+)
+from employee_tracker.shards import DEFAULT_ID_RANGE, SHARD_ID_SPACING, move_tenant
+from employee_tracker.tests import factories
+
+
+@override_settings(TENANT_SHARD_COUNT=4)
+class TenantRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = TenantRouter()
+
+    def test_hash_shard_is_stable(self):
+        """Test that tenants hash to a fixed shard within range."""
+        aliases = {hash_shard(user_id) for user_id in range(1, 200)}
+        self.assertEqual(aliases, {"shard_0", "shard_1", "shard_2", "shard_3"})
+        self.assertEqual(hash_shard(42), hash_shard(42))
+
+    def test_tenant_tables_use_active_shard(self):
+        """Test that tenant tables are routed to the active shard."""
+        with use_shard("shard_2"):
+            self.assertEqual(self.router.db_for_read(Employee), "shard_2")
+            self.assertEqual(self.router.db_for_write(Employee), "shard_2")
+            self.assertIsNone(self.router.db_for_read(TenantPlacement))
+
+    def test_no_active_shard(self):
+        """Test that tenant tables cannot be used without an active shard."""
+        with self.assertRaises(RuntimeError):
+            self.router.db_for_read(Employee)
+
+    def test_allow_migrate(self):
+        """Test that tenant tables are only created on the shards."""
+        allow = self.router.allow_migrate
+        self.assertFalse(allow("default", "employee_tracker", "employee"))
+        self.assertTrue(allow("shard_1", "employee_tracker", "employee"))
+        self.assertTrue(allow("default", "employee_tracker", "tenantplacement"))
+        self.assertFalse(allow("shard_1", "employee_tracker", "tenantplacement"))
+        self.assertIsNone(allow("default", "auth", "user"))
+        self.assertFalse(allow("shard_1", "auth", "user"))
+
+    @override_settings(TENANT_SHARD_COUNT=0)
+    def test_disabled(self):
+        """Test that the router stays out of the way when sharding is off."""
+        self.assertIsNone(self.router.db_for_read(Employee))
+        self.assertIsNone(self.router.allow_migrate("default", "employee_tracker"))
+
+
+class TenantMovingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = factories.create_user(username="testuser")
+        cls.token = factories.create_token(cls.user)
+        TenantPlacement.objects.create(user=cls.user, shard="shard_1", read_only=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    @override_settings(TENANT_SHARD_COUNT=2)
+    def test_writes_paused_while_moving(self):
+        """Test that writes are rejected while the tenant is being moved."""
+        response = self.client.post(
+            reverse("department-list"), {"name": "Engineering"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["detail"].code, "tenant_moving")
+
+
+@override_settings(TENANT_SHARD_COUNT=2)
+class MoveTenantTestCase(TestCase):
+    databases = "__all__"
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("migrate_shards", verbosity=0, stdout=StringIO())
+        cls.user = factories.create_user(username="testuser")
+        cls.other = factories.create_user(username="otheruser")
+        TenantPlacement.objects.create(user=cls.user, shard="shard_0")
+        TenantPlacement.objects.create(user=cls.other, shard="shard_1")
+        with use_shard("shard_0"):
+            cls.department = factories.create_department(cls.user, name="Sales")
+            cls.gold = factories.create_achievement(cls.user, name="Gold")
+            cls.employee = factories.create_employee(cls.user, cls.department)
+            factories.award(cls.employee, cls.gold)
+        with use_shard("shard_1"):
+            cls.other_department = factories.create_department(
+                cls.other, name="Support"
+            )
+
+    def move(self, user, target, **kwargs):
+        move_tenant(user.pk, target, grace=0, log=lambda message: None, **kwargs)
+
+    def tenant_departments(self, user_id, alias):
+        return list(
+            Department.all_objects.using(alias)
+            .filter(created_by_id=user_id)
+            .values_list("pk", flat=True)
+        )
+
+    def test_shard_id_ranges(self):
+        """Test that migrate_shards gives each shard its own id range."""
+        self.assertLess(self.department.pk, SHARD_ID_SPACING)
+        self.assertGreater(self.other_department.pk, SHARD_ID_SPACING)
+
+    def test_move_tenant(self):
+        """Test that a move copies rows with their ids and timestamps."""
+        old = timezone.now() - timedelta(days=30)
+        Department.all_objects.using("shard_0").update(updated_at=old)
+        ArchivedEmployee.objects.using("shard_0").create(
+            id=self.employee.pk + 1,
+            name="Former Employee",
+            email="former@example.com",
+            phone="1234567890",
+            address="123 Main St",
+            created_by_id=self.user.pk,
+            deleted_at=old,
+        )
+        ArchivedEmployee.objects.using("shard_0").update(archived_at=old)
+
+        call_command(
+            "move_tenant", self.user.pk, "shard_1", "--grace", "0", stdout=StringIO()
+        )
+
+        placement = TenantPlacement.objects.get(user=self.user)
+        self.assertEqual(placement.shard, "shard_1")
+        self.assertFalse(placement.read_only)
+        with use_shard("shard_1"):
+            department = Department.objects.get(pk=self.department.pk)
+            self.assertEqual(department.updated_at, old)
+            self.assertEqual(
+                list(Employee.objects.get(pk=self.employee.pk).achievements.all()),
+                [self.gold],
+            )
+            self.assertEqual(ArchivedEmployee.objects.get().archived_at, old)
+            self.assertTrue(Department.objects.filter(name="Support").exists())
+        self.assertEqual(self.tenant_departments(self.user.pk, "shard_0"), [])
+        self.assertFalse(ArchivedEmployee.objects.using("shard_0").exists())
+
+    def test_catch_up_changes(self):
+        """Test that changes made during the copy reach the target shard."""
+        passes = []
+
+        def log(message):
+            if not passes:
+                with use_shard("shard_0"):
+                    self.employee.name = "Renamed"
+                    self.employee.save()
+                    silver = factories.create_achievement(self.user, name="Silver")
+                    factories.award(self.employee, silver)
+                    self.gold.delete()
+            passes.append(message)
+
+        move_tenant(self.user.pk, "shard_1", grace=0, log=log)
+
+        with use_shard("shard_1"):
+            employee = Employee.objects.get(pk=self.employee.pk)
+            self.assertEqual(employee.name, "Renamed")
+            self.assertEqual(
+                [achievement.name for achievement in employee.achievements.all()],
+                ["Silver"],
+            )
+            self.assertFalse(Achievement.objects.filter(name="Gold").exists())
+            self.assertEqual(AchievementEmployee.objects.count(), 1)
+
+    def test_catch_up_late_commit(self):
+        """Test that a write committed after the last catch-up pass is copied."""
+
+        def log(message):
+            if message.endswith("changed rows."):
+                # Stamped before the pass started, committed after it read.
+                Employee.all_objects.using("shard_0").filter(
+                    pk=self.employee.pk
+                ).update(name="Late", updated_at=timezone.now() - timedelta(seconds=1))
+
+        move_tenant(self.user.pk, "shard_1", grace=0, log=log)
+
+        employee = Employee.objects.using("shard_1").get(pk=self.employee.pk)
+        self.assertEqual(employee.name, "Late")
+
+    def test_catch_up_unchanged_rows(self):
+        """Test that catch-up passes skip rows older than the overlap."""
+        old = timezone.now() - timedelta(days=30)
+        for model in (Department, Achievement, Employee, AchievementEmployee):
+            model._base_manager.using("shard_0").update(updated_at=old)
+        ArchivedEmployee.objects.using("shard_0").create(
+            id=self.employee.pk + 1,
+            name="Former Employee",
+            email="former@example.com",
+            phone="1234567890",
+            address="123 Main St",
+            created_by_id=self.user.pk,
+            deleted_at=old,
+        )
+        ArchivedEmployee.objects.using("shard_0").update(archived_at=old)
+
+        messages = []
+        move_tenant(self.user.pk, "shard_1", grace=0, log=messages.append)
+        self.assertEqual(messages[1], "Copied 0 changed rows.")
+
+    def test_move_back_and_forth(self):
+        """Test that moved rows never take ids from the target shard's range."""
+        self.move(self.other, "shard_0")
+        with use_shard("shard_0"):
+            department = factories.create_department(self.user)
+        self.assertLess(department.pk, SHARD_ID_SPACING)
+
+        self.move(self.other, "shard_1")
+        with use_shard("shard_1"):
+            other_department = factories.create_department(self.other)
+        self.assertGreater(other_department.pk, self.other_department.pk)
+
+        self.move(self.user, "shard_1")
+        self.assertCountEqual(
+            self.tenant_departments(self.user.pk, "shard_1"),
+            [self.department.pk, department.pk],
+        )
+        self.assertCountEqual(
+            self.tenant_departments(self.other.pk, "shard_1"),
+            [self.other_department.pk, other_department.pk],
+        )
+
+    def test_id_taken_by_another_tenant(self):
+        """Test that a move never overwrites another tenant's row."""
+        with use_shard("shard_1"):
+            Department.objects.create(
+                pk=self.department.pk, name="Taken", created_by=self.other
+            )
+        with self.assertRaises(RuntimeError):
+            self.move(self.user, "shard_1")
+
+        department = Department.objects.using("shard_1").get(pk=self.department.pk)
+        self.assertEqual(department.name, "Taken")
+        self.assertEqual(department.created_by_id, self.other.pk)
+
+    def test_rollback(self):
+        """Test that a failed move leaves the tenant on its shard."""
+        with use_shard("shard_1"):
+            factories.create_achievement(self.other, name="Gold")
+        with self.assertRaises(IntegrityError):
+            self.move(self.user, "shard_1")
+
+        placement = TenantPlacement.objects.get(user=self.user)
+        self.assertEqual(placement.shard, "shard_0")
+        self.assertFalse(placement.read_only)
+        self.assertEqual(self.tenant_departments(self.user.pk, "shard_1"), [])
+        self.assertEqual(
+            self.tenant_departments(self.user.pk, "shard_0"), [self.department.pk]
+        )
+
+    def test_delete_user(self):
+        """Test that deleting a user removes their rows from the shards."""
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertEqual(self.tenant_departments(user_id, "shard_0"), [])
+        self.assertFalse(AchievementEmployee.objects.using("shard_0").exists())
+        self.assertEqual(
+            self.tenant_departments(self.other.pk, "shard_1"),
+            [self.other_department.pk],
+        )
+
+
+@override_settings(TENANT_SHARD_COUNT=2)
+class LegacyTenantTestCase(TestCase):
+    databases = "__all__"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = factories.create_user(username="testuser")
+        cls.token = factories.create_token(cls.user)
+        # Rows written before sharding was enabled.
+        with use_shard("default"):
+            cls.department = factories.create_department(cls.user, name="Sales")
+            cls.employee = factories.create_employee(cls.user, cls.department)
+            factories.award(cls.employee, factories.create_achievement(cls.user))
+        call_command("migrate_shards", verbosity=0, stdout=StringIO())
+
+    def test_kept_on_default(self):
+        """Test that users with rows on default keep being served from it."""
+        self.assertEqual(TenantPlacement.objects.get(user=self.user).shard, "default")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        response = client.get(
+            reverse("employee-detail", kwargs={"pk": self.employee.pk})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with use_shard("default"):
+            department = factories.create_department(self.user)
+        self.assertGreaterEqual(department.pk, DEFAULT_ID_RANGE * SHARD_ID_SPACING)
+
+    def test_move_from_default(self):
+        """Test that rows on default move to a shard with their ids."""
+        other = factories.create_user(username="otheruser")
+        with use_shard("shard_0"):
+            other_department = factories.create_department(other)
+        self.assertGreater(other_department.pk, self.department.pk)
+
+        move_tenant(self.user.pk, "shard_0", grace=0, log=lambda message: None)
+
+        self.assertEqual(TenantPlacement.objects.get(user=self.user).shard, "shard_0")
+        with use_shard("shard_0"):
+            employee = Employee.objects.get(pk=self.employee.pk)
+            self.assertEqual(employee.department_id, self.department.pk)
+            self.assertEqual(employee.achievements.count(), 1)
+        self.assertFalse(Department.all_objects.using("default").exists())
+
+    def test_delete_user(self):
+        """Test that deleting a user kept on default removes their rows."""
+        self.user.delete()
+        self.assertFalse(Department.all_objects.using("default").exists())
+        self.assertFalse(AchievementEmployee.objects.using("default").exists())
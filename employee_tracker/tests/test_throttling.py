@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.throttling import LocalBucketStore
+from employee_tracker.tests import factories
+
+
+def throttle_rates(**rates):
+    """Return REST_FRAMEWORK settings with the given throttle rates."""
+    return {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+
+
+class ThrottlingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = factories.create_user(username="testuser")
+        cls.token = factories.create_token(cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(read="2/min"))
+    def test_read_budget_exhausted(self):
+        """Test that exceeding the read budget returns 429 with Retry-After."""
+        url = reverse("employee-list")
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response.headers)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(read="1/min", write="1/min"))
+    def test_budgets_are_separate(self):
+        """Test that reads and writes draw from separate budgets."""
+        self.assertEqual(
+            self.client.get(reverse("employee-list")).status_code, status.HTTP_200_OK
+        )
+        response = self.client.post(
+            reverse("department-list"), {"name": "HR"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(concurrent="1"))
+    def test_concurrent_slot_released(self):
+        """Test that in-flight slots are released after each response."""
+        url = reverse("employee-list")
+        for _ in range(3):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+
+class LocalBucketStoreTestCase(SimpleTestCase):
+    def test_consume(self):
+        """Test that tokens run out and report the wait until the next one."""
+        store = LocalBucketStore()
+        self.assertEqual(store.consume("key", 2, 1.0), 0)
+        self.assertEqual(store.consume("key", 2, 1.0), 0)
+        wait = store.consume("key", 2, 1.0)
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 1.0)
+
+    def test_acquire_release(self):
+        """Test that in-flight slots are capped and can be reused."""
+        store = LocalBucketStore()
+        self.assertTrue(store.acquire("key", 1))
+        self.assertFalse(store.acquire("key", 1))
+        store.release("key")
+        self.assertTrue(store.acquire("key", 1))
@@ -1,23 +1,27 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from rest_framework.authtoken.models import Token
-from employee_tracker.models import Department, Employee, Achievement
-from django.contrib.auth.models import User
+from employee_tracker.models import Employee, AchievementEmployee
+from employee_tracker.tests import factories
 
 
 class APITestCase(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create a test user and initial data for API tests."""
+        cls.user = factories.create_user(username="testuser")
+        cls.token = factories.create_token(cls.user)
+        cls.department = factories.create_department(cls.user, name="HR")
+        cls.achievement = factories.create_achievement(
+            cls.user, name="Best Performance"
+        )
+
+    def setUp(self):
         self.client = APIClient()
-        self.user = User.objects.create_user(username="testuser", password="12345")
-        self.token = Token.objects.create(user=self.user)
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
-        self.department = Department.objects.create(name="HR", created_by=self.user)
-        self.achievement = Achievement.objects.create(
-            name="Best Performance", created_by=self.user
-        )
 
     def test_create_employee(self):
         """Test the creation of a new Employee object via the API."""
@@ -41,16 +45,64 @@ class APITestCase(TestCase):
         self.assertEqual(Employee.objects.get().name, "Jane Doe")
         self.assertEqual(Employee.objects.get().created_by, self.user)
 
+    def test_create_employees_in_bulk(self):
+        """Test that referenced ids are resolved with one query per model."""
+        achievements = [factories.create_achievement(self.user) for _ in range(3)]
+        data = [
+            {
+                "name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "phone": "1234567890",
+                "address": "123 Main St",
+                "department_id": self.department.id,
+                "achievements": [
+                    {"achievement_id": a.id, "achievement_date": "2023-01-01"}
+                    for a in achievements
+                ],
+            }
+            for i in range(3)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("employee-list"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Employee.objects.count(), 3)
+        self.assertEqual(AchievementEmployee.objects.count(), 9)
+
+        for table in ("employee_tracker_department", "employee_tracker_achievement"):
+            lookups = [
+                q["sql"]
+                for q in queries
+                if q["sql"].startswith("SELECT")
+                and f'FROM "{table}"' in q["sql"]
+            ]
+            self.assertEqual(len(lookups), 1, table)
+
+        awards = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith("SELECT")
+            and 'FROM "employee_tracker_achievementemployee"' in q["sql"]
+        ]
+        self.assertEqual(len(awards), 1)
+        self.assertEqual(len(response.data[0]["achievements"]), 3)
+
+    def test_create_employee_other_users_department(self):
+        """Test that departments owned by another user cannot be referenced."""
+        other_department = factories.create_department(factories.create_user())
+        data = {
+            "name": "Jane Doe",
+            "email": "jane@example.com",
+            "phone": "1234567890",
+            "address": "123 Main St",
+            "department_id": other_department.id,
+        }
+        response = self.client.post(reverse("employee-list"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("department_id", response.data)
+
     def test_get_employee_list(self):
         """Test retrieving the list of Employee objects via the API."""
-        Employee.objects.create(
-            name="John Doe",
-            email="john@example.com",
-            phone="0987654321",
-            address="456 Elm St",
-            department=self.department,
-            created_by=self.user,
-        )
+        factories.create_employee(self.user, self.department)
         url = reverse("employee-list")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -58,13 +110,11 @@ class APITestCase(TestCase):
 
     def test_update_employee(self):
         """Test updating an existing Employee object via the API."""
-        employee = Employee.objects.create(
+        employee = factories.create_employee(
+            self.user,
+            self.department,
             name="John Doe",
             email="john@example.com",
-            phone="0987654321",
-            address="456 Elm St",
-            department=self.department,
-            created_by=self.user,
         )
         url = reverse("employee-detail", kwargs={"pk": employee.id})
         data = {
@@ -78,21 +128,43 @@ class APITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(Employee.objects.get(id=employee.id).name, "John Updated")
 
+    def test_partial_update_keeps_achievements(self):
+        """Test that a PATCH without achievements leaves the awards in place."""
+        employee = factories.create_employee(self.user, self.department)
+        factories.award(employee, self.achievement)
+        url = reverse("employee-detail", kwargs={"pk": employee.id})
+        response = self.client.patch(url, {"name": "John Updated"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["achievements"]), 1)
+        self.assertEqual(
+            AchievementEmployee.objects.filter(employee=employee).count(), 1
+        )
+
     def test_delete_employee(self):
         """Test deleting an Employee object via the API."""
-        employee = Employee.objects.create(
+        employee = factories.create_employee(
+            self.user,
+            self.department,
             name="John Doe",
             email="john@example.com",
-            phone="0987654321",
-            address="456 Elm St",
-            department=self.department,
-            created_by=self.user,
         )
         url = reverse("employee-detail", kwargs={"pk": employee.id})
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Employee.objects.count(), 0)
 
+    def test_delete_department_keeps_employees(self):
+        """Test that deleting a Department hides it from its employees."""
+        employee = factories.create_employee(self.user, self.department)
+        url = reverse("department-detail", kwargs={"pk": self.department.id})
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        url = reverse("employee-detail", kwargs={"pk": employee.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["department"])
+
     def test_register_user(self):
         """Test user registration via the API."""
         url = reverse("register")
@@ -118,3 +190,76 @@ class APITestCase(TestCase):
         url = reverse("logout")
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_employee_sets_validators(self):
+        """Test that retrieving an Employee returns ETag and Last-Modified headers."""
+        employee = factories.create_employee(
+            self.user,
+            self.department,
+            name="John Doe",
+            email="john@example.com",
+        )
+        url = reverse("employee-detail", kwargs={"pk": employee.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response.headers)
+        self.assertIn("Last-Modified", response.headers)
+
+    def test_retrieve_employee_not_modified(self):
+        """Test that a matching If-None-Match returns 304 without serializing."""
+        employee = factories.create_employee(
+            self.user,
+            self.department,
+            name="John Doe",
+            email="john@example.com",
+        )
+        url = reverse("employee-detail", kwargs={"pk": employee.id})
+        etag = self.client.get(url).headers["ETag"]
+        # One query for the token, one for the object's timestamps.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.department.name = "People"
+        self.department.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_retrieve_employee_after_achievement_deleted(self):
+        """Test that deleting an achievement changes the ETag of its holders."""
+        employee = factories.create_employee(self.user, self.department)
+        factories.award(employee, self.achievement)
+        factories.award(employee, factories.create_achievement(self.user))
+        url = reverse("employee-detail", kwargs={"pk": employee.id})
+        etag = self.client.get(url).headers["ETag"]
+
+        self.client.delete(
+            reverse("achievement-detail", kwargs={"pk": self.achievement.id})
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["achievements"]), 1)
+
+    def test_update_employee_if_match(self):
+        """Test that updates with a stale If-Match are rejected."""
+        employee = factories.create_employee(
+            self.user,
+            self.department,
+            name="John Doe",
+            email="john@example.com",
+        )
+        url = reverse("employee-detail", kwargs={"pk": employee.id})
+        etag = self.client.get(url).headers["ETag"]
+
+        response = self.client.patch(
+            url, {"name": "John Updated"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+        response = self.client.patch(
+            url, {"name": "John Stale"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Employee.objects.get(id=employee.id).name, "John Updated")
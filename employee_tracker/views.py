@@ -6,7 +6,7 @@ from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
+from .mixins import ConditionalRetrieveMixin, TenantShardMixin
 from .models import Employee, Department, Achievement
 from .serializers import (
     UserSerializer,
@@ -23,8 +23,8 @@ class RegisterView(APIView):
     """
 
     permission_classes = [AllowAny]
+    throttle_scope = "login"
 
-    @extend_schema(request=UserSerializer, responses={201: UserSerializer})
     def post(self, request):
         serializer = UserSerializer(data=request.data)
         if serializer.is_valid():
@@ -43,11 +43,8 @@ class LoginView(APIView):
     """
 
     permission_classes = [AllowAny]
+    throttle_scope = "login"
 
-    @extend_schema(
-        request=LoginSerializer,
-        responses={200: "Login successful", 401: "Invalid credentials"},
-    )
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
@@ -71,13 +68,14 @@ class LogoutView(APIView):
     API endpoint for user logout.
     """
 
-    @extend_schema(request=None, responses={200: "Logout successful"})
     def post(self, request):
         request.user.auth_token.delete()
         return Response(status=status.HTTP_200_OK)
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(
+    TenantShardMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows employee CRUD operations.
     """
@@ -92,15 +90,32 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     filterset_fields = ["department"]
     search_fields = ["name", "email"]
     ordering_fields = ["name", "department__name"]
+    conditional_fields = [
+        "updated_at",
+        "department__updated_at",
+        "achievementemployee__updated_at",
+        "achievementemployee__achievement__updated_at",
+    ]
+    # Deleting an achievement removes its awards without touching the
+    # remaining timestamps.
+    conditional_counts = ["achievementemployee"]
 
     def get_queryset(self):
         return self.queryset.filter(created_by=self.request.user)
 
+    def get_serializer(self, *args, **kwargs):
+        # Creating with a list payload creates the employees in bulk.
+        if self.action == "create" and isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(
+    TenantShardMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows department CRUD operations.
     """
@@ -115,7 +130,9 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class AchievementViewSet(viewsets.ModelViewSet):
+class AchievementViewSet(
+    TenantShardMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows achievement CRUD operations.
     """